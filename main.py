@@ -82,13 +82,49 @@ def main():
     if args.solver:
         reports_dir = Path("exports/reports")
 
-        reproduce_friction_experiments()
-
-        reproduce_barrier_experiments()
-
-        validate_friction_experiments(reports_dir)
-
-        validate_barrier_experiments(reports_dir)
+        observer = None
+        if args.live_plot:
+            observer = LivePlotObserver()
+        elif args.progress_log:
+            observer = JsonLinesObserver(Path(args.progress_log))
+
+        workers = args.workers or None
+        cache = None if args.no_cache else ProfileCache(Path(args.cache_dir))
+
+        reproduce_friction_experiments(
+            observer, args.ensemble, workers, method=args.method, warm_start=not args.cold_start, cache=cache,
+            instrument=args.instrument, export_csv=args.export_csv,
+            integrator=args.integrator, adaptive_cfl=args.adaptive_cfl, well_balanced=args.well_balanced,
+            resolution=args.resolution, grid_levels=args.grid_levels, refinement=args.refinement,
+            dtype=np.float32 if args.single_precision else np.float64,
+        )
+
+        reproduce_barrier_experiments(
+            observer, args.ensemble, workers, method=args.method, warm_start=not args.cold_start, cache=cache,
+            instrument=args.instrument, export_csv=args.export_csv, checkpoint_dir=args.checkpoint_dir, checkpoint_interval=args.checkpoint_interval,
+            integrator=args.integrator, adaptive_cfl=args.adaptive_cfl, well_balanced=args.well_balanced,
+            resolution=args.resolution, grid_levels=args.grid_levels, refinement=args.refinement,
+            dtype=np.float32 if args.single_precision else np.float64,
+        )
+
+        # The analysis side only sees the profiles, keyed the way each validation groups its observations
+        friction_profiles = ResultsStore(Path("exports/numerical/friction")).cases(["Set Flow (l/s)", "Incline (%)"])
+        validate_friction_experiments(reports_dir, friction_profiles)
+
+        barrier_profiles = ResultsStore(Path("exports/numerical/barriers")).cases(["Barrier Setup", "Set Flow (l/s)"])
+        validate_barrier_experiments(reports_dir, barrier_profiles)
+
+    if args.benchmark:
+        write_grid_scaling_report(Path("exports/reports"), max_steady_cells=args.max_steady_cells)
+
+    if args.calibrate:
+        workers = args.workers or None
+        cache = None if args.no_cache else ProfileCache(Path(args.cache_dir))
+
+        write_calibration_report(Path("exports/reports"), workers=workers, cache=cache)
+
+    if args.sensitivity:
+        write_sensitivity_report(Path("exports/reports"), samples=args.sensitivity_samples, workers=args.workers or None)
 
 
 if __name__ == "__main__":
@@ -153,22 +153,27 @@ def write_friction_report(name: str, path: Path):
 
     df.to_csv(path / name, index=False)
 
+def flow_half_width(nominal_flow: float) -> float:
+    # The flow meter reads to 0.2% of the flow, plus a 2 mm/s velocity error over the 350 mm pipe
+    D = 0.350
+    area = np.pi * (D / 2) ** 2
+    velocity_error_m_s = 0.002
+    flow_error_from_velocity_ls = area * velocity_error_m_s * 1000
+
+    relative_error = 0.002 * nominal_flow
+
+    return relative_error + flow_error_from_velocity_ls
+
 def run_monte_carlo_analysis(csv_data_path: Path, model, report_path: Path, trials: int = 200000):
     df = pd.read_csv(csv_data_path)
     
     unique_conditions = df[["Barrier Setup", "Operation Mode", "Set Flow (l/s)"]].drop_duplicates()
     condition_to_flow_samples = {}
     
-    D = 0.350
-    area = np.pi * (D / 2) ** 2
-    velocity_error_m_s = 0.002
-    flow_error_from_velocity_ls = area * velocity_error_m_s * 1000
-    
     for _, row in unique_conditions.iterrows():
         nominal_flow = row["Set Flow (l/s)"]
         
-        relative_error = 0.002 * nominal_flow
-        total_flow_half_width = relative_error + flow_error_from_velocity_ls
+        total_flow_half_width = flow_half_width(nominal_flow)
         
         samples = np.random.uniform(
             nominal_flow - total_flow_half_width, 
@@ -324,16 +329,10 @@ def run_friction_monte_carlo_analysis(trials: int = 200000):
     unique_conditions = df[["Set Flow (l/s)", "Incline (%)"]].drop_duplicates()
     condition_to_flow_samples = {}
     
-    D = 0.350
-    area = np.pi * (D / 2) ** 2
-    velocity_error_m_s = 0.002
-    flow_error_from_velocity_ls = area * velocity_error_m_s * 1000
-    
     for _, row in unique_conditions.iterrows():
         nominal_flow = row["Set Flow (l/s)"]
         
-        relative_error = 0.002 * nominal_flow
-        total_flow_half_width = relative_error + flow_error_from_velocity_ls
+        total_flow_half_width = flow_half_width(nominal_flow)
         
         samples = np.random.uniform(
             nominal_flow - total_flow_half_width, 
@@ -1,3 +1,6 @@
+import numpy as np
+import pandas as pd
+
 def rmse(observed, predicted):
     return ((predicted - observed) ** 2).mean() ** 0.5
 
@@ -20,4 +23,42 @@ def _kge(observed, predicted):
     return 1 - ((corr - 1) ** 2 + (var - 1) ** 2 + (bias - 1) ** 2) ** 0.5
 
 def r2(observed, predicted):
-    return 1 - ((predicted - observed) ** 2).sum() / ((observed - observed.mean()) ** 2).sum()
\ No newline at end of file
+    return 1 - ((predicted - observed) ** 2).sum() / ((observed - observed.mean()) ** 2).sum()
+
+def grouped_metrics(observed: np.ndarray, predicted: np.ndarray, groups: np.ndarray, n_groups: int) -> pd.DataFrame:
+    # Same definitions as the functions above, evaluated for every group at once over the pairs both sides recorded
+    finite = np.isfinite(observed) & np.isfinite(predicted)
+    observed, predicted, groups = observed[finite], predicted[finite], groups[finite]
+
+    def total(values):
+        return np.bincount(groups, weights=values, minlength=n_groups)
+
+    count = np.bincount(groups, minlength=n_groups)
+    error = predicted - observed
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_observed = total(observed) / count
+        mean_predicted = total(predicted) / count
+
+        dev_observed = observed - mean_observed[groups]
+        dev_predicted = predicted - mean_predicted[groups]
+
+        ss_observed = total(dev_observed * dev_observed)
+        ss_predicted = total(dev_predicted * dev_predicted)
+        covariance = total(dev_observed * dev_predicted)
+        sse = total(error * error)
+
+        variability = np.sqrt(ss_predicted / ss_observed)
+        correlation = covariance / np.sqrt(ss_observed * ss_predicted)
+        bias_ratio = mean_predicted / mean_observed
+
+        return pd.DataFrame({
+            "Count": count,
+            "RMSE": np.sqrt(sse / count),
+            "MAE": total(np.abs(error)) / count,
+            "Absolute Bias": total(error) / count,
+            "Variability Ratio": variability,
+            "Correlation": correlation,
+            "KGE": 1 - np.sqrt((correlation - 1) ** 2 + (variability - 1) ** 2 + (bias_ratio - 1) ** 2),
+            "R Squared": 1 - sse / ss_observed,
+        })
@@ -3,130 +3,96 @@ import pandas as pd
 from pathlib import Path
 from . import objective
 
-def validate_friction_experiments(report_directory: Path):
+def _predict_depths(df: pd.DataFrame, keys: list[str], simulated: dict) -> tuple[np.ndarray, np.ndarray, list]:
+    obs_x = df["X Position (mm)"].to_numpy(dtype=float) / 1000.0
+
+    predicted = np.full(len(df), np.nan)
+    case_ids = np.full(len(df), -1)
+    cases = []
+
+    # One interpolation per simulated profile over all of that case's observations
+    for key, rows in df.groupby(keys).indices.items():
+        sim = simulated.get(key)
+        if sim is None:
+            continue
+
+        predicted[rows] = np.interp(obs_x[rows], sim[:, 0], sim[:, 1])
+        case_ids[rows] = len(cases)
+        cases.append(key)
+
+    return predicted, case_ids, cases
+
+def _write_metrics(f, title: str, metrics: pd.Series):
+    f.write(f"{title}\n")
+    f.write(f"RMSE: {metrics['RMSE']}\n")
+    f.write(f"MAE: {metrics['MAE']}\n")
+    f.write(f"Absolute Bias: {metrics['Absolute Bias']}\n")
+    f.write(f"Variability Ratio: {metrics['Variability Ratio']}\n")
+    f.write(f"Correlation: {metrics['Correlation']}\n")
+    f.write(f"KGE: {metrics['KGE']}\n")
+    f.write(f"R Squared: {metrics['R Squared']}\n")
+
+def _case_metrics(observed: np.ndarray, predicted: np.ndarray, case_ids: np.ndarray, cases: list, keys: list[str]) -> pd.DataFrame:
+    metrics = objective.grouped_metrics(observed, predicted, case_ids, len(cases))
+    case_df = pd.DataFrame(cases, columns=keys)
+
+    return pd.concat([case_df, metrics], axis=1)
+
+def validate_friction_experiments(report_directory: Path, simulated: dict[tuple, np.ndarray]):
     path = Path("data/ManningsNExperiments.csv")
     df = pd.read_csv(path)
-    
-    observed_list = []
-    predicted_list = []
-    
-    grouped = df.groupby(["Set Flow (l/s)", "Incline (%)"])
-    
-    for (flow_ls, incline_pct), group in grouped:
-        filename = f"{int(incline_pct * 10)}-{int(flow_ls)}.csv"
-        sim_path = Path("exports/numerical/friction") / filename
-        
-        if sim_path.exists():
-            sim_df = pd.read_csv(sim_path)
-            
-            for _, row in group.iterrows():
-                obs_x = row["X Position (mm)"] / 1000.0
-                obs_depth = row["Depth (mm)"]
-                
-                pred_depth = np.interp(obs_x, sim_df["X Position (m)"], sim_df["Depth (mm)"])
-                
-                observed_list.append(obs_depth)
-                predicted_list.append(pred_depth)
-                
-    observed = pd.Series(observed_list)
-    predicted = pd.Series(predicted_list)
-    
-    rmse = objective.rmse(observed, predicted)
-    mae = objective.mae(observed, predicted)
-    bias = objective.bias(observed, predicted)
-    var = objective.variability(observed, predicted)
-    corr = objective.correlation(observed, predicted)
-    kge = objective._kge(observed, predicted)
-    r2 = objective.r2(observed, predicted)
-    
+
+    keys = ["Set Flow (l/s)", "Incline (%)"]
+
+    predicted, case_ids, cases = _predict_depths(df, keys, simulated)
+    valid = case_ids >= 0
+
+    observed = df["Depth (mm)"].to_numpy(dtype=float)[valid]
+    predicted = predicted[valid]
+    case_ids = case_ids[valid]
+
+    pooled = objective.grouped_metrics(observed, predicted, np.zeros(len(observed), dtype=int), 1).iloc[0]
+
     file_path = report_directory / "FrictionValidationReport.txt"
-    
+
     with open(file_path, "w") as f:
-        f.write("Friction Validation Report\n")
-        f.write(f"RMSE: {rmse}\n")
-        f.write(f"MAE: {mae}\n")
-        f.write(f"Absolute Bias: {bias}\n")
-        f.write(f"Variability Ratio: {var}\n")
-        f.write(f"Correlation: {corr}\n")
-        f.write(f"KGE: {kge}\n")
-        f.write(f"R Squared: {r2}\n")
-
-def validate_barrier_experiments(report_directory: Path):
+        _write_metrics(f, "Friction Validation Report", pooled)
+
+    per_case = _case_metrics(observed, predicted, case_ids, cases, keys)
+    per_case.to_csv(report_directory / "FrictionValidationCases.csv", index=False)
+
+def validate_barrier_experiments(report_directory: Path, simulated: dict[tuple, np.ndarray]):
     path = Path("data/BarrierExperiments.csv")
     df = pd.read_csv(path)
-    
-    observed_all = []
-    predicted_all = []
-    
-    observed_upstream = []
-    predicted_upstream = []
-    
-    observed_downstream = []
-    predicted_downstream = []
-    
-    grouped = df.groupby(["Barrier Setup", "Set Flow (l/s)"])
-    
-    for (barrier_setup, flow_ls), group in grouped:
-        filename = f"{barrier_setup}-{flow_ls}.csv"
-        sim_path = Path("exports/numerical/barriers") / filename
-        
-        if sim_path.exists():
-            sim_df = pd.read_csv(sim_path)
-            
-            for _, row in group.iterrows():
-                obs_x_mm = row["X Position (mm)"]
-                obs_x_m = obs_x_mm / 1000.0
-                obs_depth = row["Depth (mm)"]
-                
-                pred_depth = np.interp(obs_x_m, sim_df["X Position (m)"], sim_df["Depth (mm)"])
-                
-                observed_all.append(obs_depth)
-                predicted_all.append(pred_depth)
-                
-                if obs_x_mm < 5000:
-                    observed_upstream.append(obs_depth)
-                    predicted_upstream.append(pred_depth)
-                else:
-                    observed_downstream.append(obs_depth)
-                    predicted_downstream.append(pred_depth)
-                
-    observed_all = pd.Series(observed_all)
-    predicted_all = pd.Series(predicted_all)
-    
-    observed_upstream = pd.Series(observed_upstream)
-    predicted_upstream = pd.Series(predicted_upstream)
-    
-    observed_downstream = pd.Series(observed_downstream)
-    predicted_downstream = pd.Series(predicted_downstream)
-    
+
+    keys = ["Barrier Setup", "Set Flow (l/s)"]
+
+    predicted, case_ids, cases = _predict_depths(df, keys, simulated)
+    valid = case_ids >= 0
+
+    observed = df["Depth (mm)"].to_numpy(dtype=float)[valid]
+    predicted = predicted[valid]
+    case_ids = case_ids[valid]
+    upstream = df["X Position (mm)"].to_numpy()[valid] < 5000
+
+    # Region 0 pools everything; regions 1 and 2 split the same observations by side of the barrier
+    regions = ["All", "Upstream", "Downstream"]
+    region = np.where(upstream, 1, 2)
+
+    groups = np.concatenate((np.zeros(len(observed), dtype=int), region))
+    pooled = objective.grouped_metrics(np.tile(observed, 2), np.tile(predicted, 2), groups, len(regions))
+
     file_path = report_directory / "BarrierValidationReport.txt"
-    
+
     with open(file_path, "w") as f:
-        f.write("Barrier Validation Report - All\n")
-        f.write(f"RMSE: {objective.rmse(observed_all, predicted_all)}\n")
-        f.write(f"MAE: {objective.mae(observed_all, predicted_all)}\n")
-        f.write(f"Absolute Bias: {objective.bias(observed_all, predicted_all)}\n")
-        f.write(f"Variability Ratio: {objective.variability(observed_all, predicted_all)}\n")
-        f.write(f"Correlation: {objective.correlation(observed_all, predicted_all)}\n")
-        f.write(f"KGE: {objective._kge(observed_all, predicted_all)}\n")
-        f.write(f"R Squared: {objective.r2(observed_all, predicted_all)}\n")
-        f.write("\n")
-        
-        f.write("Barrier Validation Report - Upstream\n")
-        f.write(f"RMSE: {objective.rmse(observed_upstream, predicted_upstream)}\n")
-        f.write(f"MAE: {objective.mae(observed_upstream, predicted_upstream)}\n")
-        f.write(f"Absolute Bias: {objective.bias(observed_upstream, predicted_upstream)}\n")
-        f.write(f"Variability Ratio: {objective.variability(observed_upstream, predicted_upstream)}\n")
-        f.write(f"Correlation: {objective.correlation(observed_upstream, predicted_upstream)}\n")
-        f.write(f"KGE: {objective._kge(observed_upstream, predicted_upstream)}\n")
-        f.write(f"R Squared: {objective.r2(observed_upstream, predicted_upstream)}\n")
-        f.write("\n")
-        
-        f.write("Barrier Validation Report - Downstream\n")
-        f.write(f"RMSE: {objective.rmse(observed_downstream, predicted_downstream)}\n")
-        f.write(f"MAE: {objective.mae(observed_downstream, predicted_downstream)}\n")
-        f.write(f"Absolute Bias: {objective.bias(observed_downstream, predicted_downstream)}\n")
-        f.write(f"Variability Ratio: {objective.variability(observed_downstream, predicted_downstream)}\n")
-        f.write(f"Correlation: {objective.correlation(observed_downstream, predicted_downstream)}\n")
-        f.write(f"KGE: {objective._kge(observed_downstream, predicted_downstream)}\n")
-        f.write(f"R Squared: {objective.r2(observed_downstream, predicted_downstream)}\n")
\ No newline at end of file
+        for i, name in enumerate(regions):
+            if i:
+                f.write("\n")
+            _write_metrics(f, f"Barrier Validation Report - {name}", pooled.iloc[i])
+
+    case_groups = np.concatenate((case_ids * 3, case_ids * 3 + region))
+    per_case = objective.grouped_metrics(np.tile(observed, 2), np.tile(predicted, 2), case_groups, 3 * len(cases))
+    per_case.insert(0, "Region", np.tile(regions, len(cases)))
+    per_case = pd.concat([pd.DataFrame(np.repeat(np.array(cases, dtype=object), 3, axis=0), columns=keys), per_case], axis=1)
+
+    per_case.to_csv(report_directory / "BarrierValidationCases.csv", index=False)
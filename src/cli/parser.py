@@ -22,3 +22,135 @@ class CustomParser(ArgumentParser):
             action="store_true",
             help="Run the lab data solver script",
         )
+        self.add_argument(
+            "--live-plot",
+            action="store_true",
+            help="Show a live plot of each solver run",
+        )
+        self.add_argument(
+            "--progress-log",
+            type=str,
+            default=None,
+            help="Write solver progress as JSON lines to this file",
+        )
+        self.add_argument(
+            "--ensemble",
+            action="store_true",
+            help="Solve each experiment sweep as one batched ensemble",
+        )
+        self.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of solver processes to use, 0 for all cores",
+        )
+        self.add_argument(
+            "--cold-start",
+            action="store_true",
+            help="Start every solver run from rest instead of the previous flow's profile",
+        )
+        self.add_argument(
+            "--cache-dir",
+            type=str,
+            default="exports/cache",
+            help="Directory for cached solver profiles",
+        )
+        self.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Re-solve every case instead of reusing cached profiles",
+        )
+        self.add_argument(
+            "--instrument",
+            action="store_true",
+            help="Write per-kernel timings and residual history next to each solver profile",
+        )
+        self.add_argument(
+            "--checkpoint-dir",
+            type=str,
+            default=None,
+            help="Checkpoint barrier runs here and resume any found on restart",
+        )
+        self.add_argument(
+            "--checkpoint-interval",
+            type=float,
+            default=60.0,
+            help="Wall-clock seconds between checkpoints",
+        )
+        self.add_argument(
+            "--export-csv",
+            action="store_true",
+            help="Also write each solver profile as its own CSV beside the results store",
+        )
+        self.add_argument(
+            "--method",
+            choices=["explicit", "local", "implicit", "steady"],
+            default="explicit",
+            help="Solve by explicit time marching, explicit marching with local time steps, implicit pseudo-time Newton iteration or directly for the steady profile",
+        )
+        self.add_argument(
+            "--integrator",
+            choices=["heun", "ssprk3"],
+            default="heun",
+            help="Time integrator for explicit marching: Heun's RK2 or three-stage SSP Runge-Kutta",
+        )
+        self.add_argument(
+            "--adaptive-cfl",
+            action="store_true",
+            help="Grow the Courant number while the solution stays smooth and back off on negative depths or oscillations",
+        )
+        self.add_argument(
+            "--well-balanced",
+            action="store_true",
+            help="Use hydrostatic reconstruction at the true face beds so resting and uniform flows are held exactly",
+        )
+        self.add_argument(
+            "--resolution",
+            type=float,
+            default=0.1,
+            help="Cell size in metres for the solver grid",
+        )
+        self.add_argument(
+            "--grid-levels",
+            type=int,
+            default=1,
+            help="Converge on this many grids, halving the cell size each time and finishing at --resolution",
+        )
+        self.add_argument(
+            "--refinement",
+            type=float,
+            default=None,
+            help="Grade the mesh down to this cell size in metres around the barrier and any hydraulic jump",
+        )
+        self.add_argument(
+            "--single-precision",
+            action="store_true",
+            help="Store solver states in float32, keeping convergence checks in float64",
+        )
+        self.add_argument(
+            "--benchmark",
+            action="store_true",
+            help="Time solver steps on grids from 10^2 to 10^5 cells and runs to steady state up to --max-steady-cells",
+        )
+        self.add_argument(
+            "--max-steady-cells",
+            type=int,
+            default=10000,
+            help="Run the benchmark to steady state only up to this many cells and estimate the larger grids; 10^5 cells takes hours",
+        )
+        self.add_argument(
+            "--calibrate",
+            action="store_true",
+            help="Fit the Manning's n values and barrier coefficients to the experiments with steady solver runs",
+        )
+        self.add_argument(
+            "--sensitivity",
+            action="store_true",
+            help="Compute Sobol indices of the upstream depth at each barrier setup and flow from steady solver runs",
+        )
+        self.add_argument(
+            "--sensitivity-samples",
+            type=int,
+            default=256,
+            help="Base sample size for the sensitivity analysis, which must be a power of two",
+        )
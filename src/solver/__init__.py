@@ -3,4 +3,21 @@
 # SPDX-License-Identifier: GPL-2.0-only
 
 from .flume import Flume
+from .geometry import FlumeGeometry
+from .ensemble import simulate_ensemble, simulate_flumes
+from .steady import simulate_steady
+from .implicit import simulate_implicit
+from .unsteady import simulate_hydrograph
+from .cache import ProfileCache
+from .friction import FrictionParameters, load_friction_parameters
+from .rating import BarrierRatingTable, BatchedBarrierRating
+from .instrumentation import SolverInstrumentation
+from .checkpoint import SolverCheckpoint
+from .cfl import AdaptiveCFL
+from .store import ResultsStore
+from .snapshots import SnapshotRecorder, load_snapshots
+from .benchmark import benchmark_grid_scaling, write_grid_scaling_report
+from .calibration import calibrate_friction, calibrate_barriers, write_calibration_report
+from .sensitivity import barrier_sensitivity, write_sensitivity_report
+from .observers import *
 from .validation import *
\ No newline at end of file
@@ -0,0 +1,99 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import time
+import pandas as pd
+
+from pathlib import Path
+from typing import Sequence
+from .flume import Flume
+from .geometry import FlumeGeometry
+from .cfl import AdaptiveCFL
+from .solver import simulate, channel_max_time, _channel_engine
+
+def _bed_function(flume: Flume):
+    return lambda x: -flume.incline * x
+
+def _step_time(flume: Flume, steps: int) -> float:
+    engine, _, _ = _channel_engine(flume.flow, _bed_function(flume), flume._get_mannings_fn(), integrator=flume.integrator, well_balanced=flume.well_balanced, geometry=flume.geometry, dtype=flume.dtype)
+
+    # A few untimed steps so allocation and the first transient do not count
+    for _ in range(3):
+        engine.step()
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        engine.step()
+
+    return (time.perf_counter() - start) / steps
+
+def benchmark_grid_scaling(
+    cells: Sequence[int] = (100, 1000, 10000, 100000),
+    flow: float = 0.02,
+    incline: float = 0.005,
+    steps: int = 100,
+    max_steady_cells: int | None = 10000,
+    geometry: FlumeGeometry | None = None,
+    **flume_options,
+) -> pd.DataFrame:
+    geometry = geometry or FlumeGeometry()
+
+    rows = []
+    measured = None
+
+    for N in sorted(cells):
+        flume = Flume(None, flow, incline, geometry=geometry.replace(resolution=geometry.length / N), **flume_options)
+        step_time = _step_time(flume, steps)
+
+        if max_steady_cells is None or N <= max_steady_cells:
+            start = time.perf_counter()
+            model_time, _, steps_to_steady = simulate(flume.flow, _bed_function(flume), flume._get_mannings_fn(), integrator=flume.integrator, cfl=AdaptiveCFL() if flume.adaptive_cfl else None, well_balanced=flume.well_balanced, geometry=flume.geometry, dtype=flume.dtype)
+            wall_time = time.perf_counter() - start
+
+            # The run only stops short of its time cap once it has converged
+            converged = model_time < channel_max_time
+            if not converged:
+                print(f"Benchmark run on {N} cells stopped at the {channel_max_time} s model time cap before converging")
+
+            measured = (N, steps_to_steady, model_time)
+            estimated = False
+        else:
+            # Past the measured range the CFL step shrinks with the cells, so steps grow in proportion to the cell count
+            if measured is None:
+                raise ValueError("At least one grid must be run to steady state before larger grids can be estimated")
+            N_measured, steps_measured, model_time = measured
+            steps_to_steady = int(round(steps_measured * N / N_measured))
+            wall_time = steps_to_steady * step_time
+            converged = None
+            estimated = True
+
+        rows.append({
+            "Cells": N,
+            "Cell Size (m)": geometry.length / N,
+            "Step Time (s)": step_time,
+            "Cell Update Time (ns)": step_time / N * 1e9,
+            "Steps To Steady": steps_to_steady,
+            "Model Time (s)": model_time,
+            "Time To Steady (s)": wall_time,
+            "Converged": converged,
+            "Estimated": estimated,
+        })
+
+    results = pd.DataFrame(rows)
+
+    # Columns that hold estimates on the larger grids say so, and from which size
+    if results["Estimated"].any():
+        label = f" (estimated above {max_steady_cells} cells)"
+        results = results.rename(columns={column: column + label for column in ("Steps To Steady", "Model Time (s)", "Time To Steady (s)")})
+
+    return results
+
+def write_grid_scaling_report(report_directory: Path, **options) -> pd.DataFrame:
+    results = benchmark_grid_scaling(**options)
+
+    report_directory = Path(report_directory)
+    report_directory.mkdir(parents=True, exist_ok=True)
+    results.to_csv(report_directory / "GridScalingBenchmark.csv", index=False)
+
+    return results
@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import os
+import json
+import hashlib
+import numpy as np
+
+from pathlib import Path
+
+# Bump whenever a change to the solvers alters converged profiles, so stale entries stop matching
+SOLVER_VERSION = 5
+
+def profile_key(flume, method: str, start: str = "cold") -> str:
+    n_bed, n_wall = flume._friction_coefficients()
+
+    params = {
+        "barrier": flume.barrier if isinstance(flume.barrier, str) else flume.barriers or None,
+        "flow": float(flume.flow),
+        "incline": float(flume.incline),
+        "friction": [float(n_bed), float(n_wall)],
+        "barrier_coefficients": [float(flume.coeff_velocity), float(flume.coeff_contraction)],
+        "grid": {**flume.geometry.parameters(), "levels": flume.grid_levels, "refinement": flume.refinement},
+        "method": method,
+        # Where marching started: from rest, from the previous flow's profile or from a given seed.
+        # Runs through a jump can settle differently depending on it, so the three never share entries
+        "start": start,
+        "integrator": flume.integrator,
+        "adaptive_cfl": flume.adaptive_cfl,
+        "well_balanced": flume.well_balanced,
+        "dtype": np.dtype(flume.dtype).name,
+        "version": SOLVER_VERSION,
+    }
+
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+class ProfileCache:
+    def __init__(self, directory: str | Path = "exports/cache", max_bytes: int = 256 * 1024**2):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def key(self, flume, method: str, start: str = "cold") -> str:
+        return profile_key(flume, method, start)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def get(self, key: str) -> np.ndarray | None:
+        path = self._path(key)
+
+        try:
+            with np.load(path) as data:
+                profile = data["profile"]
+            # Touch on read so eviction drops the least recently used entries first
+            os.utime(path)
+        except (OSError, KeyError, ValueError):
+            return None
+
+        return profile
+
+    def put(self, key: str, profile: np.ndarray):
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = self.directory / f"{key}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, profile=profile)
+        os.replace(tmp_path, self._path(key))
+
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self.directory.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
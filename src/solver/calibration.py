@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import numpy as np
+import pandas as pd
+
+from pathlib import Path
+from typing import Callable, Sequence
+from scipy.optimize import minimize
+from .flume import Flume
+from .friction import FrictionParameters, load_friction_parameters
+from .cache import ProfileCache
+from .validation import _solve_cached, _profile_table
+
+def _calibrate(data: pd.DataFrame, keys: list[str], make_flume: Callable[[tuple, np.ndarray], Flume], x0: Sequence[float], bounds: Sequence[tuple[float, float]], method: str, workers: int | None, ensemble: bool, cache: ProfileCache | None, max_evaluations: int) -> tuple[np.ndarray, dict]:
+    groups = data.groupby(keys).indices
+    cases = list(groups)
+
+    obs_x = data["X Position (mm)"].to_numpy(dtype=float) / 1000.0
+    obs_depth = data["Depth (mm)"].to_numpy(dtype=float)
+
+    # Every candidate restarts each case from its profile under the previous candidate
+    seeds = [None] * len(cases)
+    history = {}
+
+    x0 = np.asarray(x0, dtype=float)
+
+    def misfit(z: np.ndarray) -> float:
+        params = x0 * z
+        key = tuple(np.round(params, 12))
+        if key in history:
+            return history[key]
+
+        flumes = [make_flume(case, params) for case in cases]
+        results = _solve_cached(flumes, None, ensemble, workers, None, method, True, cache, seeds=seeds)
+
+        errors = []
+        for i, (case, flume, result) in enumerate(zip(cases, flumes, results)):
+            if isinstance(result, Exception):
+                history[key] = np.inf
+                return np.inf
+
+            seeds[i] = result
+            table = _profile_table(result, flume.incline, flume.geometry.length)
+            rows = groups[case]
+            errors.append(np.interp(obs_x[rows], table[:, 0], table[:, 1]) - obs_depth[rows])
+
+        errors = np.concatenate(errors)
+        history[key] = float(np.sqrt(np.mean(errors * errors)))
+
+        return history[key]
+
+    # Searching in multiples of the starting values puts coefficients of very different size on the same footing
+    initial = misfit(np.ones(len(x0)))
+    result = minimize(
+        misfit,
+        np.ones(len(x0)),
+        method="Nelder-Mead",
+        bounds=[(lo / x, hi / x) for x, (lo, hi) in zip(x0, bounds)],
+        options={"maxfev": max_evaluations, "xatol": 1e-3, "fatol": 1e-3},
+    )
+
+    summary = {
+        "Initial RMSE (mm)": initial,
+        "Calibrated RMSE (mm)": float(result.fun),
+        "Evaluations": len(history),
+    }
+
+    return x0 * result.x, summary
+
+def calibrate_friction(data: pd.DataFrame | None = None, friction: FrictionParameters | None = None, method: str = "steady", workers: int | None = 1, ensemble: bool = False, cache: ProfileCache | None = None, max_evaluations: int = 200, **flume_options) -> tuple[FrictionParameters, dict]:
+    if data is None:
+        data = pd.read_csv(Path("data/ManningsNExperiments.csv"))
+    friction = friction or load_friction_parameters()
+
+    # The regression's confidence interval bounds the search where it is available
+    bounds = [
+        friction.bed_bounds or (0.25 * friction.n_bed, 4.0 * friction.n_bed),
+        friction.wall_bounds or (0.25 * friction.n_wall, 4.0 * friction.n_wall),
+    ]
+
+    def make_flume(case: tuple, params: np.ndarray) -> Flume:
+        flow_ls, incline_pct = case
+        return Flume(None, flow_ls / 1000.0, incline_pct / 100.0, FrictionParameters(*params), **flume_options)
+
+    (n_bed, n_wall), summary = _calibrate(data, ["Set Flow (l/s)", "Incline (%)"], make_flume, [friction.n_bed, friction.n_wall], bounds, method, workers, ensemble, cache, max_evaluations)
+
+    return FrictionParameters(n_bed, n_wall, friction.bed_bounds, friction.wall_bounds), summary
+
+def calibrate_barriers(data: pd.DataFrame | None = None, friction: FrictionParameters | None = None, coeff_velocity: float = 0.98, coeff_contraction: float = np.pi / (np.pi + 2), method: str = "steady", workers: int | None = 1, ensemble: bool = False, cache: ProfileCache | None = None, max_evaluations: int = 200, **flume_options) -> tuple[tuple[float, float], dict]:
+    if data is None:
+        data = pd.read_csv(Path("data/BarrierExperiments.csv"))
+    friction = friction or load_friction_parameters()
+
+    # A velocity coefficient cannot exceed one, and a contraction lies between Borda's mouthpiece and none at all
+    bounds = [(0.8, 1.0), (0.5, 1.0)]
+
+    def make_flume(case: tuple, params: np.ndarray) -> Flume:
+        barrier_setup, flow_ls = case
+        return Flume(barrier_setup, flow_ls / 1000.0, 0.0, friction, coeff_velocity=params[0], coeff_contraction=params[1], **flume_options)
+
+    coefficients, summary = _calibrate(data, ["Barrier Setup", "Set Flow (l/s)"], make_flume, [coeff_velocity, coeff_contraction], bounds, method, workers, ensemble, cache, max_evaluations)
+
+    return tuple(float(c) for c in coefficients), summary
+
+def write_calibration_report(report_directory: Path, **options) -> pd.DataFrame:
+    # Friction is fitted first on the barrier-free runs, then held while the barrier coefficients are fitted
+    friction, friction_summary = calibrate_friction(**options)
+    (coeff_velocity, coeff_contraction), barrier_summary = calibrate_barriers(friction=friction, **options)
+
+    report_directory = Path(report_directory)
+    report_directory.mkdir(parents=True, exist_ok=True)
+
+    values = pd.DataFrame([{
+        "Bed": friction.n_bed,
+        "Wall": friction.n_wall,
+        "Velocity Coefficient": coeff_velocity,
+        "Contraction Coefficient": coeff_contraction,
+    }])
+    values.to_csv(report_directory / "CalibrationValues.csv", index=False)
+
+    with open(report_directory / "CalibrationReport.txt", "w") as f:
+        for i, (title, summary) in enumerate([("Friction Calibration", friction_summary), ("Barrier Calibration", barrier_summary)]):
+            if i:
+                f.write("\n")
+            f.write(f"{title}\n")
+            f.write(f"Initial RMSE: {summary['Initial RMSE (mm)']}\n")
+            f.write(f"Calibrated RMSE: {summary['Calibrated RMSE (mm)']}\n")
+            f.write(f"Evaluations: {summary['Evaluations']}\n")
+
+    return values
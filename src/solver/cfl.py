@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import numpy as np
+
+class AdaptiveCFL:
+    def __init__(
+        self,
+        initial: float = 0.49,
+        minimum: float = 0.2,
+        maximum: float = 0.9,
+        growth: float = 1.01,
+        backoff: float = 0.5,
+        oscillation_tolerance: float = 1e-2,
+    ):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.growth = growth
+        self.backoff = backoff
+        self.oscillation_tolerance = oscillation_tolerance
+
+        self.rejected = 0
+
+    def start(self, engine):
+        engine.courant = np.full(engine.zb.shape[:-1], self.initial)[()]
+
+    def _total_variation(self, eta: np.ndarray) -> np.ndarray:
+        return np.abs(np.diff(eta[..., 1:-1], axis=-1)).sum(axis=-1)
+
+    def update(self, engine) -> np.ndarray:
+        U, U_n = engine.U, engine.U_n
+
+        depth = U[0, ..., 1:-1] - engine.zb[..., 1:-1]
+        positive = depth.min(axis=-1) >= 0.0
+
+        # Spurious oscillations show up as a jump in the total variation of the free surface
+        tv_old = self._total_variation(U_n[0])
+        tv_new = self._total_variation(U[0])
+        smooth = tv_new - tv_old <= self.oscillation_tolerance * np.maximum(tv_old, depth.mean(axis=-1))
+
+        # At the floor there is nothing left to back off to, so the step stands
+        accepted = (positive & smooth) | (engine.courant <= self.minimum)
+
+        if not np.all(accepted):
+            rejected = ~accepted
+            np.copyto(U, U_n, where=rejected[..., np.newaxis])
+            self.rejected += int(np.count_nonzero(rejected))
+
+        engine.courant = np.where(
+            accepted,
+            np.minimum(engine.courant * self.growth, self.maximum),
+            np.maximum(engine.courant * self.backoff, self.minimum),
+        )[()]
+
+        return accepted
@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import os
+import time
+import numpy as np
+
+from pathlib import Path
+
+class SolverCheckpoint:
+    def __init__(self, path: Path, interval: float = 60.0, key: str = ""):
+        self.path = Path(path)
+        self.interval = interval
+        self.key = key
+        self.last_save = time.perf_counter()
+
+    def load(self, shape: tuple[int, ...]) -> dict | None:
+        try:
+            with np.load(self.path) as data:
+                key = str(data["key"])
+                state = {
+                    "U": data["U"],
+                    "t": float(data["t"]),
+                    "step": int(data["step"]),
+                    "max_change": float(data["max_change"]),
+                    # Older checkpoints predate adaptive CFL and resume at the engine's own Courant number
+                    "courant": data["courant"][()] if "courant" in data else None,
+                }
+        except (OSError, ValueError, KeyError):
+            return None
+
+        # A checkpoint from another run, or from another grid, cannot be resumed
+        if key != self.key or state["U"].shape != shape:
+            return None
+
+        return state
+
+    def save(self, U: np.ndarray, t: float, step: int, max_change: float, courant: float | np.ndarray | None = None):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write beside the target and swap in, so a pre-empted write never leaves a torn checkpoint
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            extra = {"courant": courant} if courant is not None else {}
+            np.savez(f, U=U, t=t, step=step, max_change=max_change, key=self.key, **extra)
+        os.replace(tmp_path, self.path)
+
+        self.last_save = time.perf_counter()
+
+    def update(self, U: np.ndarray, t: float, step: int, max_change: float, courant: float | np.ndarray | None = None):
+        if time.perf_counter() - self.last_save >= self.interval:
+            self.save(U, t, step, max_change, courant)
+
+    def clear(self):
+        self.path.unlink(missing_ok=True)
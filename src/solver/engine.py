@@ -0,0 +1,501 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import numpy as np
+
+from typing import Callable, Sequence
+from .friction import FrictionParameters
+from .rating import BarrierRatingTable, BatchedBarrierRating
+from .cfl import AdaptiveCFL
+
+g = 9.81
+
+class SolverEngine:
+    def __init__(
+        self,
+        zb: np.ndarray,
+        zb_interface: np.ndarray,
+        dx: float | np.ndarray,
+        flow_rate: float,
+        mannings_function: Callable,
+        barrier_function: Callable | Sequence[Callable] | None = None,
+        barrier_idx: int | Sequence[int] | None = None,
+        local_timestep: bool = False,
+        integrator: str = "heun",
+        cfl: AdaptiveCFL | None = None,
+        well_balanced: bool = False,
+        dtype: type = np.float64,
+        width: float = 1.0,
+        outlet: str | float = "critical",
+    ):
+        if integrator not in ("heun", "ssprk3"):
+            raise ValueError(f"Unknown integrator: {integrator}")
+
+        M = zb.shape[-1]
+        cells = zb.shape
+        faces = zb.shape[:-1] + (M - 1,)
+        inner = zb.shape[:-1] + (M - 2,)
+
+        # A scalar dx is a uniform grid; an array gives every cell its own width, ghosts included
+        self.dx = dx if np.ndim(dx) == 0 else np.asarray(dx, dtype=dtype)
+        self.uniform = np.ndim(dx) == 0
+        self.cell_dx = np.broadcast_to(self.dx, (M,))
+        self.inner_dx = self.dx if self.uniform else self.dx[1:-1]
+        self.flow_rate = flow_rate
+        self.mannings_function = mannings_function
+        self.barrier_function = barrier_function
+        self.barrier_idx = barrier_idx
+        self.local_timestep = local_timestep
+        self.integrator = integrator
+        self.cfl = cfl
+        self.courant = 0.49
+        self.well_balanced = well_balanced
+        self.dtype = np.dtype(dtype)
+        self.width = width
+        self.outlet = outlet
+
+        if barrier_function is not None:
+            self._init_barriers(barrier_function, barrier_idx)
+
+        # Folded friction coefficients when the Manning closure is a known composite
+        self.friction_a = None
+        self.friction_b = None
+        if isinstance(mannings_function, FrictionParameters):
+            self.friction_a = mannings_function.a
+            self.friction_b = mannings_function.b / width
+
+        self.zb = np.ascontiguousarray(zb, dtype=dtype)
+        self.zb_interface = np.ascontiguousarray(zb_interface, dtype=dtype)
+        self.two_zb_interface = 2.0 * self.zb_interface
+        self.bed_slope = -g * np.gradient(self.zb, dx, axis=-1) if self.uniform else np.zeros(cells, dtype=dtype)
+        if well_balanced or not self.uniform:
+            # Differencing the face beds matches the pressure flux term for term, whatever the bed or cell widths
+            self.bed_slope[..., 0] = 0.0
+            self.bed_slope[..., -1] = 0.0
+            self.bed_slope[..., 1:-1] = -g * np.diff(self.zb_interface, axis=-1) / self.inner_dx
+
+        # Limited slopes become face offsets of a quarter cell; uneven cells also need the centre spacing
+        self.slope_scale = 0.25 if self.uniform else 0.25 * self.dx[1:-1]
+        self.inv_spacing = None if self.uniform else 2.0 / (self.dx[:-1] + self.dx[1:])
+
+        # State and stage buffers, stored component-major so eta and q are contiguous
+        self.U = np.zeros((2,) + cells, dtype=dtype)
+        self.U_n = np.zeros((2,) + cells, dtype=dtype)
+        self.K1 = np.zeros((2,) + cells, dtype=dtype)
+        self.K2 = np.zeros((2,) + cells, dtype=dtype)
+        self.K3 = np.zeros((2,) + cells, dtype=dtype) if integrator == "ssprk3" else None
+        self.work = np.zeros((2,) + cells, dtype=dtype)
+
+        # Reconstruction
+        self.diff = np.zeros((2,) + faces, dtype=dtype)
+        self.half_slope = np.zeros((2,) + cells, dtype=dtype)
+        self.sign_bwd = np.zeros((2,) + inner, dtype=dtype)
+        self.sign_fwd = np.zeros((2,) + inner, dtype=dtype)
+        self.U_L = np.zeros((2,) + faces, dtype=dtype)
+        self.U_R = np.zeros((2,) + faces, dtype=dtype)
+
+        # HLL flux
+        self.h_L = np.zeros(faces, dtype=dtype)
+        self.h_R = np.zeros(faces, dtype=dtype)
+        self.u_L = np.zeros(faces, dtype=dtype)
+        self.u_R = np.zeros(faces, dtype=dtype)
+        self.a_L = np.zeros(faces, dtype=dtype)
+        self.a_R = np.zeros(faces, dtype=dtype)
+        self.S_L = np.zeros(faces, dtype=dtype)
+        self.S_R = np.zeros(faces, dtype=dtype)
+        self.face_tmp = np.zeros(faces, dtype=dtype)
+        self.F_L = np.zeros(faces, dtype=dtype)
+        self.F_R = np.zeros(faces, dtype=dtype)
+        self.F = np.zeros((2,) + faces, dtype=dtype)
+        self.wet_L = np.zeros(faces, dtype=bool)
+        self.wet_R = np.zeros(faces, dtype=bool)
+        self.dry_L = np.zeros(faces, dtype=bool)
+        self.dry_R = np.zeros(faces, dtype=bool)
+        self.cond_L = np.zeros(faces, dtype=bool)
+        self.cond_R = np.zeros(faces, dtype=bool)
+        self.cond_star = np.zeros(faces, dtype=bool)
+
+        # Source and timestep
+        self.h = np.zeros(cells, dtype=dtype)
+        self.cell_tmp = np.zeros(cells, dtype=dtype)
+        self.S = np.zeros(cells, dtype=dtype)
+        self.wet = np.zeros(cells, dtype=bool)
+        self.dry = np.zeros(cells, dtype=bool)
+        self.friction = np.zeros(cells, dtype=dtype)
+        self.local_speed = np.zeros(cells, dtype=dtype)
+        self.local_dt = np.zeros(cells, dtype=dtype)
+
+        # Convergence is judged in double precision whatever the state is stored in
+        self.change = np.zeros(cells)
+
+    def apply_bcs(self, U: np.ndarray):
+        eta, q = U
+        zb = self.zb
+
+        eta[0] = eta[1] - zb[1] + zb[0]
+        q[0] = self.flow_rate
+
+        q_out = q[-2]
+
+        if self.outlet == "critical":
+            h_interior = max(eta[-2] - zb[-2], 1e-6)
+            h_c = (q_out**2 / g)**(1/3)
+
+            if h_interior < h_c:
+                eta[-1] = eta[-2] - zb[-2] + zb[-1]
+            else:
+                eta[-1] = h_c
+        elif self.outlet == "free":
+            eta[-1] = eta[-2] - zb[-2] + zb[-1]
+        else:
+            # Tailgate holding a fixed depth over the outlet
+            eta[-1] = zb[-1] + self.outlet
+        q[-1] = q_out
+
+    def spatial_reconstructor(self, U: np.ndarray):
+        diff = self.diff
+        np.subtract(U[..., 1:], U[..., :-1], out=diff)
+        if not self.uniform:
+            np.multiply(diff, self.inv_spacing, out=diff)
+
+        bwd = diff[..., :-1]
+        fwd = diff[..., 1:]
+
+        # minmod limited slope, scaled to half a cell so the dx factors cancel
+        np.sign(bwd, out=self.sign_bwd)
+        np.sign(fwd, out=self.sign_fwd)
+        np.add(self.sign_bwd, self.sign_fwd, out=self.sign_bwd)
+        np.abs(bwd, out=self.sign_fwd)
+        interior = self.half_slope[..., 1:-1]
+        np.abs(fwd, out=interior)
+        np.minimum(self.sign_fwd, interior, out=interior)
+        np.multiply(interior, self.sign_bwd, out=interior)
+        np.multiply(interior, self.slope_scale, out=interior)
+
+        if self.well_balanced:
+            # Carry the neighbouring slope into the ghosts so a linear surface reconstructs exactly at the boundary faces
+            self.half_slope[..., 0] = self.half_slope[..., 1]
+            self.half_slope[..., -1] = self.half_slope[..., -2]
+
+        np.add(U[..., :-1], self.half_slope[..., :-1], out=self.U_L)
+        np.subtract(U[..., 1:], self.half_slope[..., 1:], out=self.U_R)
+
+        if self.well_balanced:
+            # Hydrostatic reconstruction: a face never sees a surface below its bed, so depths stay non-negative
+            np.maximum(self.U_L[0], self.zb_interface, out=self.U_L[0])
+            np.maximum(self.U_R[0], self.zb_interface, out=self.U_R[0])
+
+        return self.U_L, self.U_R
+
+    def _side_flux(self, eta: np.ndarray, q: np.ndarray, u: np.ndarray, out: np.ndarray):
+        tmp = self.face_tmp
+
+        np.subtract(eta, self.two_zb_interface, out=tmp)
+        np.multiply(tmp, eta, out=tmp)
+        np.multiply(tmp, 0.5 * g, out=tmp)
+        np.multiply(q, u, out=out)
+        np.add(out, tmp, out=out)
+
+    def hll_flux(self, U_L: np.ndarray, U_R: np.ndarray):
+        eta_L, q_L = U_L
+        eta_R, q_R = U_R
+        h_L, h_R = self.h_L, self.h_R
+        u_L, u_R = self.u_L, self.u_R
+        a_L, a_R = self.a_L, self.a_R
+        S_L, S_R = self.S_L, self.S_R
+        tmp = self.face_tmp
+
+        np.subtract(eta_L, self.zb_interface, out=h_L)
+        np.maximum(h_L, 0.0, out=h_L)
+        np.subtract(eta_R, self.zb_interface, out=h_R)
+        np.maximum(h_R, 0.0, out=h_R)
+
+        np.greater(h_L, 0.0, out=self.wet_L)
+        np.greater(h_R, 0.0, out=self.wet_R)
+        np.logical_not(self.wet_L, out=self.dry_L)
+        np.logical_not(self.wet_R, out=self.dry_R)
+
+        u_L.fill(0.0)
+        u_R.fill(0.0)
+        np.divide(q_L, h_L, out=u_L, where=self.wet_L)
+        np.divide(q_R, h_R, out=u_R, where=self.wet_R)
+
+        np.multiply(h_L, g, out=a_L)
+        np.sqrt(a_L, out=a_L)
+        np.multiply(h_R, g, out=a_R)
+        np.sqrt(a_R, out=a_R)
+
+        np.subtract(u_L, a_L, out=S_L)
+        np.subtract(u_R, a_R, out=tmp)
+        np.minimum(S_L, tmp, out=S_L)
+        np.add(u_L, a_L, out=S_R)
+        np.add(u_R, a_R, out=tmp)
+        np.maximum(S_R, tmp, out=S_R)
+
+        np.multiply(a_R, 2.0, out=tmp)
+        np.subtract(u_R, tmp, out=tmp)
+        np.copyto(S_L, tmp, where=self.dry_L)
+        np.multiply(a_L, 2.0, out=tmp)
+        np.subtract(u_L, tmp, out=tmp)
+        np.copyto(S_R, tmp, where=self.dry_R)
+
+        np.greater_equal(S_L, 0.0, out=self.cond_L)
+        np.less_equal(S_R, 0.0, out=self.cond_R)
+        np.logical_or(self.cond_L, self.cond_R, out=self.cond_star)
+        np.logical_not(self.cond_star, out=self.cond_star)
+
+        self._side_flux(eta_L, q_L, u_L, self.F_L)
+        self._side_flux(eta_R, q_R, u_R, self.F_R)
+
+        for F, F_L, F_R, Q_L, Q_R in (
+            (self.F[0], q_L, q_R, eta_L, eta_R),
+            (self.F[1], self.F_L, self.F_R, q_L, q_R),
+        ):
+            np.multiply(S_R, F_L, out=F)
+            np.multiply(S_L, F_R, out=tmp)
+            np.subtract(F, tmp, out=F)
+            np.subtract(Q_R, Q_L, out=tmp)
+            np.multiply(tmp, S_L, out=tmp)
+            np.multiply(tmp, S_R, out=tmp)
+            np.add(F, tmp, out=F)
+            np.subtract(S_R, S_L, out=tmp)
+            np.divide(F, tmp, out=F, where=self.cond_star)
+
+            np.copyto(F, F_L, where=self.cond_L)
+            np.copyto(F, F_R, where=self.cond_R)
+
+        return self.F
+
+    def mannings_n(self, h: np.ndarray):
+        return self.mannings_function(h)
+
+    def get_source(self, U: np.ndarray):
+        eta, q = U
+        h = self.h
+        S = self.S
+        tmp = self.cell_tmp
+
+        np.subtract(eta, self.zb, out=h)
+        np.maximum(h, 0.0, out=h)
+        np.greater(h, 1e-6, out=self.wet)
+        np.logical_not(self.wet, out=self.dry)
+
+        np.multiply(eta, self.bed_slope, out=S)
+
+        friction = self.friction
+
+        if self.friction_a is not None:
+            # g n^2 / (h R^(4/3)) = g (a / h + b / width)^(4/3) / h, one power per cell
+            np.maximum(h, 1e-6, out=tmp)
+            np.divide(self.friction_a, tmp, out=friction)
+            np.add(friction, self.friction_b, out=friction)
+            np.power(friction, 4/3, out=friction)
+            np.divide(friction, tmp, out=friction)
+            np.abs(q, out=tmp)
+            np.multiply(friction, tmp, out=friction)
+            np.multiply(friction, q, out=friction)
+            np.multiply(friction, g, out=friction)
+            np.copyto(friction, 0.0, where=self.dry)
+        else:
+            mannings_n = self.mannings_n(h)
+
+            # h * R^(4/3) with R = h / (1 + 2h / width)
+            np.multiply(h, 2.0 / self.width, out=tmp)
+            np.add(tmp, 1.0, out=tmp)
+            np.divide(h, tmp, out=tmp)
+            np.power(tmp, 4/3, out=tmp)
+            np.multiply(tmp, h, out=tmp)
+
+            np.abs(q, out=friction)
+            np.multiply(friction, q, out=friction)
+            np.multiply(friction, mannings_n, out=friction)
+            np.multiply(friction, mannings_n, out=friction)
+            np.multiply(friction, g, out=friction)
+            np.divide(friction, tmp, out=friction, where=self.wet)
+            np.copyto(friction, 0.0, where=self.dry)
+
+        np.subtract(S, friction, out=S)
+
+        return S
+
+    def _init_barriers(self, barrier_function: Callable | Sequence[Callable], barrier_idx: int | Sequence[int]):
+        functions = [barrier_function] if callable(barrier_function) else list(barrier_function)
+        self.barrier_faces = np.atleast_1d(np.asarray(barrier_idx, dtype=int))
+
+        if len(functions) != len(self.barrier_faces):
+            raise ValueError("Every barrier needs its own face")
+        if np.any(np.diff(self.barrier_faces) < 2):
+            raise ValueError("Barriers must be at least two cells apart")
+
+        # Rating tables share one interpolation per stage however many barriers there are
+        self.barrier_functions = functions
+        self.barrier_rating = None
+        if all(isinstance(fn, BarrierRatingTable) for fn in functions):
+            self.barrier_rating = BatchedBarrierRating(functions)
+
+    def rate_barriers(self, h_L: np.ndarray, h_R: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        if self.barrier_rating is not None:
+            return self.barrier_rating(h_L, h_R)
+
+        q_b = np.zeros(len(self.barrier_functions))
+        M_jet = np.zeros(len(self.barrier_functions))
+        for i, fn in enumerate(self.barrier_functions):
+            q_b[i], M_jet[i] = fn(h_L[i], h_R[i])
+
+        return q_b, M_jet
+
+    def apply_barrier_fluxes(self, K: np.ndarray, U_L: np.ndarray, U_R: np.ndarray, F: np.ndarray):
+        b = self.barrier_faces
+        dx_L, dx_R = self.cell_dx[b], self.cell_dx[b + 1]
+
+        z_int = self.zb_interface[b]
+        eta_L = U_L[0, b]
+        eta_R = U_R[0, b]
+
+        h_L = np.maximum(eta_L - z_int, 0.0)
+        h_R = np.maximum(eta_R - z_int, 0.0)
+        q_b, M_jet = self.rate_barriers(np.maximum(h_L, 1e-9), h_R)
+
+        h_L_safe = np.maximum(h_L, 1e-6)
+        F_L_mom = q_b * q_b / h_L_safe + 0.5 * g * (eta_L * eta_L - 2.0 * eta_L * z_int)
+        F_R_mom = M_jet + 0.5 * g * (eta_R * eta_R - 2.0 * eta_R * z_int)
+
+        K[0, b] = (F[0, b - 1] - q_b) / dx_L
+        K[1, b] = (F[1, b - 1] - F_L_mom) / dx_L
+        K[0, b + 1] = (q_b - F[0, b + 1]) / dx_R
+        K[1, b + 1] = (F_R_mom - F[1, b + 1]) / dx_R
+
+    def residual(self, U: np.ndarray, K: np.ndarray):
+        U_L, U_R = self.spatial_reconstructor(U)
+        F = self.hll_flux(U_L, U_R)
+
+        interior = K[..., 1:-1]
+        np.subtract(F[..., :-1], F[..., 1:], out=interior)
+        np.multiply(interior, 1.0 / self.inner_dx, out=interior)
+
+        if self.barrier_function is not None:
+            self.apply_barrier_fluxes(K, U_L, U_R, F)
+
+        S = self.get_source(U)
+        np.add(K[1, ..., 1:-1], S[..., 1:-1], out=K[1, ..., 1:-1])
+
+        return K
+
+    def dynamic_timestep(self, U: np.ndarray):
+        eta, q = U
+        h = self.h
+        speed = self.cell_tmp
+
+        np.subtract(eta, self.zb, out=h)
+        np.maximum(h, 0.0, out=h)
+        np.greater(h, 0.0, out=self.wet)
+
+        speed.fill(0.0)
+        np.divide(q, h, out=speed, where=self.wet)
+        np.abs(speed, out=speed)
+        np.multiply(h, g, out=h)
+        np.sqrt(h, out=h)
+        np.add(speed, h, out=speed)
+
+        if self.local_timestep:
+            # Each cell is limited by the fastest wave that can reach it from either neighbour
+            local = self.local_speed
+            np.maximum(speed[..., :-2], speed[..., 2:], out=local[..., 1:-1])
+            np.maximum(local[..., 1:-1], speed[..., 1:-1], out=local[..., 1:-1])
+            local[..., 0] = local[..., 1]
+            local[..., -1] = local[..., -2]
+            np.maximum(local, 1e-12, out=local)
+
+            dt = self.local_dt
+            np.divide(self.dx, local, out=dt)
+            np.nextafter(dt, -np.inf, out=dt)
+            np.multiply(dt, np.expand_dims(self.courant, -1), out=dt)
+
+            return dt
+
+        if not self.uniform:
+            # The smallest cell need not carry the fastest wave, so take the tightest cell-by-cell limit
+            np.maximum(speed, 1e-12, out=speed)
+            np.divide(self.dx, speed, out=speed)
+            return self.courant * np.nextafter(speed.min(axis=-1), -np.inf)
+
+        max_speed = speed.max(axis=-1)
+
+        return self.courant * np.nextafter(self.dx / max_speed, -np.inf)
+
+    def _heun(self, dt_cells):
+        U, U_n, K1, K2, work = self.U, self.U_n, self.K1, self.K2, self.work
+
+        self.residual(U, K1)
+        np.multiply(K1, dt_cells, out=work)
+        np.add(U, work, out=U)
+        self.apply_bcs(U)
+
+        self.residual(U, K2)
+        np.add(K1, K2, out=work)
+        np.multiply(work, 0.5 * dt_cells, out=work)
+        np.add(U_n, work, out=U)
+        self.apply_bcs(U)
+
+    def _ssprk3(self, dt_cells):
+        U, U_n, K1, K2, K3, work = self.U, self.U_n, self.K1, self.K2, self.K3, self.work
+
+        # Shu-Osher form: each stage is a forward Euler step blended back towards U_n
+        self.residual(U, K1)
+        np.multiply(K1, dt_cells, out=work)
+        np.add(U, work, out=U)
+        self.apply_bcs(U)
+
+        self.residual(U, K2)
+        np.multiply(K2, dt_cells, out=work)
+        np.add(U, work, out=U)
+        np.multiply(U, 0.25, out=U)
+        np.multiply(U_n, 0.75, out=work)
+        np.add(U, work, out=U)
+        self.apply_bcs(U)
+
+        self.residual(U, K3)
+        np.multiply(K3, dt_cells, out=work)
+        np.add(U, work, out=U)
+        np.multiply(U, 2 / 3, out=U)
+        np.multiply(U_n, 1 / 3, out=work)
+        np.add(U, work, out=U)
+        self.apply_bcs(U)
+
+    def step(self, max_dt: float | None = None):
+        U, U_n = self.U, self.U_n
+
+        np.copyto(U_n, U)
+
+        dt = self.dynamic_timestep(U)
+        if max_dt is not None:
+            dt = np.minimum(dt, max_dt)
+        dt_cells = dt if self.local_timestep else dt[..., np.newaxis]
+
+        if self.integrator == "ssprk3":
+            self._ssprk3(dt_cells)
+        else:
+            self._heun(dt_cells)
+
+        change = self.change
+        np.subtract(U[0], U_n[0], out=change, dtype=np.float64)
+        np.abs(change, out=change)
+
+        if self.local_timestep:
+            # Pseudo time has no meaning per cell, so converge on the net continuity update over each cell's own step.
+            # A single stage is not enough: the stages can settle cancelling each other with neither of them zero
+            np.divide(change, dt, out=change)
+            max_change = change[..., 1:-1].max(axis=-1)
+            dt = dt.min(axis=-1).astype(np.float64)
+        else:
+            dt = dt.astype(np.float64)
+            max_change = change.max(axis=-1) / dt
+
+        if self.cfl is not None:
+            # A rejected step leaves the state untouched, so it counts as a step of zero length that cannot converge
+            accepted = self.cfl.update(self)
+            dt = np.where(accepted, dt, 0.0)[()]
+            max_change = np.where(accepted, max_change, np.inf)[()]
+
+        return dt, max_change
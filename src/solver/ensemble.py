@@ -0,0 +1,307 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import numpy as np
+
+from typing import Callable, Sequence
+from .engine import SolverEngine, g
+from .flume import Flume
+from .rating import BarrierRatingTable, BatchedBarrierRating
+from .friction import FrictionParameters
+from .cfl import AdaptiveCFL
+from .geometry import FlumeGeometry
+from .solver import barrier_max_time, channel_max_time, _bed_geometry, _cell_layout
+
+def _group_rows(functions: Sequence[Callable | None]) -> list[tuple[Callable, np.ndarray]]:
+    groups = {}
+    for i, fn in enumerate(functions):
+        if fn is not None:
+            groups.setdefault(id(fn), (fn, []))[1].append(i)
+
+    return [(fn, np.array(rows)) for fn, rows in groups.values()]
+
+class EnsembleEngine(SolverEngine):
+    def __init__(
+        self,
+        zb: np.ndarray,
+        zb_interface: np.ndarray,
+        dx: float,
+        flow_rates: np.ndarray,
+        mannings_functions: Sequence[Callable],
+        barrier_functions: Sequence[Callable | None],
+        barrier_idx: int | None,
+        shared_timestep: bool = False,
+        integrator: str = "heun",
+        cfl: AdaptiveCFL | None = None,
+        well_balanced: bool = False,
+        dtype: type = np.float64,
+        width: float = 1.0,
+        outlet: str | float = "critical",
+    ):
+        self.mannings_functions = list(mannings_functions)
+        self.barrier_functions = list(barrier_functions)
+        self.shared_timestep = shared_timestep
+
+        self.barrier_rows = np.array([i for i, fn in enumerate(self.barrier_functions) if fn is not None], dtype=int)
+        has_barrier = self.barrier_rows.size > 0
+
+        super().__init__(
+            zb,
+            zb_interface,
+            dx,
+            np.asarray(flow_rates, dtype=float),
+            None,
+            self.barrier_functions if has_barrier else None,
+            barrier_idx,
+            integrator=integrator,
+            cfl=cfl,
+            well_balanced=well_balanced,
+            dtype=dtype,
+            width=width,
+            outlet=outlet,
+        )
+
+        self.mannings_groups = _group_rows(self.mannings_functions)
+
+        if all(isinstance(fn, FrictionParameters) for fn in self.mannings_functions):
+            self.friction_a = np.array([fn.a for fn in self.mannings_functions], dtype=dtype)[:, np.newaxis]
+            self.friction_b = np.array([fn.b / width for fn in self.mannings_functions], dtype=dtype)[:, np.newaxis]
+        self.mannings_buffer = np.zeros(zb.shape, dtype=dtype)
+
+    # Per-case arrays that carry the state or the bed, and per-case scratch that is rewritten every stage
+    state_buffers = ("zb", "zb_interface", "two_zb_interface", "bed_slope")
+    scratch_buffers = (
+        "h_L", "h_R", "u_L", "u_R", "a_L", "a_R", "S_L", "S_R", "face_tmp", "F_L", "F_R",
+        "wet_L", "wet_R", "dry_L", "dry_R", "cond_L", "cond_R", "cond_star",
+        "h", "cell_tmp", "S", "wet", "dry", "friction", "local_speed", "local_dt", "change", "mannings_buffer",
+    )
+    component_buffers = ("U_n", "K1", "K2", "K3", "work", "diff", "half_slope", "sign_bwd", "sign_fwd", "U_L", "U_R", "F")
+
+    def retain(self, keep: np.ndarray) -> "EnsembleEngine":
+        rows = np.flatnonzero(keep)
+        n = rows.size
+
+        # Kept rows move to the front of each buffer and the engine narrows its views onto them, so nothing is reallocated
+        for name in self.state_buffers:
+            buffer = getattr(self, name)
+            buffer[:n] = buffer[rows]
+            setattr(self, name, buffer[:n])
+        for name in self.scratch_buffers:
+            setattr(self, name, getattr(self, name)[:n])
+
+        self.U[:, :n] = self.U[:, rows]
+        self.U = self.U[:, :n]
+        for name in self.component_buffers:
+            buffer = getattr(self, name)
+            if buffer is not None:
+                setattr(self, name, buffer[:, :n])
+
+        self.flow_rate = self.flow_rate[rows]
+        if np.ndim(self.courant):
+            self.courant = np.asarray(self.courant)[rows]
+        if isinstance(self.friction_a, np.ndarray):
+            self.friction_a = self.friction_a[rows]
+            self.friction_b = self.friction_b[rows]
+
+        self.mannings_functions = [self.mannings_functions[i] for i in rows]
+        self.mannings_groups = _group_rows(self.mannings_functions)
+
+        kept_barriers = np.flatnonzero(keep[self.barrier_rows])
+        self.barrier_functions = [self.barrier_functions[i] for i in rows]
+        self.barrier_rows = np.array([i for i, fn in enumerate(self.barrier_functions) if fn is not None], dtype=int)
+
+        if self.barrier_rows.size == 0:
+            self.barrier_function = None
+        elif self.barrier_function is not None:
+            self.barrier_groups = _group_rows([self.barrier_functions[i] for i in self.barrier_rows])
+            if self.batched_rating is not None:
+                self.batched_rating = self.batched_rating.retain(kept_barriers)
+
+        return self
+
+    def _init_barriers(self, barrier_functions: Sequence[Callable | None], barrier_idx: int):
+        # Each row holds at most one barrier and every barrier sits on the same face
+        tables = [barrier_functions[i] for i in self.barrier_rows]
+        self.barrier_groups = _group_rows(tables)
+
+        self.batched_rating = None
+        if all(isinstance(table, BarrierRatingTable) for table in tables):
+            self.batched_rating = BatchedBarrierRating(tables)
+
+    def apply_bcs(self, U: np.ndarray):
+        eta, q = U
+        zb = self.zb
+
+        eta[:, 0] = eta[:, 1] - zb[:, 1] + zb[:, 0]
+        q[:, 0] = self.flow_rate
+
+        q_out = q[:, -2]
+
+        if self.outlet == "critical":
+            h_interior = np.maximum(eta[:, -2] - zb[:, -2], 1e-6)
+            h_c = (q_out**2 / g)**(1/3)
+
+            eta[:, -1] = np.where(h_interior < h_c, eta[:, -2] - zb[:, -2] + zb[:, -1], h_c)
+        elif self.outlet == "free":
+            eta[:, -1] = eta[:, -2] - zb[:, -2] + zb[:, -1]
+        else:
+            eta[:, -1] = zb[:, -1] + self.outlet
+        q[:, -1] = q_out
+
+    def mannings_n(self, h: np.ndarray):
+        if len(self.mannings_groups) == 1:
+            return self.mannings_groups[0][0](h)
+
+        n = self.mannings_buffer
+        for fn, rows in self.mannings_groups:
+            n[rows] = fn(h[rows])
+
+        return n
+
+    def apply_barrier_fluxes(self, K: np.ndarray, U_L: np.ndarray, U_R: np.ndarray, F: np.ndarray):
+        b = self.barrier_idx
+        rows = self.barrier_rows
+        dx_L, dx_R = self.cell_dx[b], self.cell_dx[b + 1]
+
+        z_int = self.zb_interface[rows, b]
+        eta_L = U_L[0, rows, b]
+        eta_R = U_R[0, rows, b]
+
+        h_L = np.maximum(eta_L - z_int, 0.0)
+        h_R = np.maximum(eta_R - z_int, 0.0)
+
+        if self.batched_rating is not None:
+            q_b, M_jet = self.batched_rating(np.maximum(h_L, 1e-9), h_R)
+        else:
+            q_b = np.zeros(rows.size)
+            M_jet = np.zeros(rows.size)
+            for fn, members in self.barrier_groups:
+                q_b[members], M_jet[members] = fn(np.maximum(h_L[members], 1e-9), h_R[members])
+
+        h_L_safe = np.maximum(h_L, 1e-6)
+        F_L_mom = q_b * q_b / h_L_safe + 0.5 * g * (eta_L * eta_L - 2.0 * eta_L * z_int)
+        F_R_mom = M_jet + 0.5 * g * (eta_R * eta_R - 2.0 * eta_R * z_int)
+
+        K[0, rows, b] = (F[0, rows, b - 1] - q_b) / dx_L
+        K[1, rows, b] = (F[1, rows, b - 1] - F_L_mom) / dx_L
+        K[0, rows, b + 1] = (q_b - F[0, rows, b + 1]) / dx_R
+        K[1, rows, b + 1] = (F_R_mom - F[1, rows, b + 1]) / dx_R
+
+    def dynamic_timestep(self, U: np.ndarray):
+        dt = super().dynamic_timestep(U)
+
+        if self.shared_timestep:
+            dt = np.full_like(dt, dt.min())
+
+        return dt
+
+def simulate_ensemble(
+    flow_rates: Sequence[float],
+    bed_functions: Sequence[Callable | None],
+    mannings_functions: Sequence[Callable],
+    barrier_functions: Sequence[Callable | None] | None = None,
+    shared_timestep: bool = False,
+    integrator: str = "heun",
+    cfl: AdaptiveCFL | None = None,
+    well_balanced: bool = False,
+    geometry: FlumeGeometry | None = None,
+    dtype: type = np.float64,
+):
+    geometry = geometry or FlumeGeometry()
+    length = geometry.length
+    start_depth = 0.05
+
+    dx, x_vals = _cell_layout(length, geometry.resolution)
+    N = len(x_vals)
+
+    # Discharge per unit width, as the solver state carries it
+    flow_rates = np.asarray(flow_rates, dtype=float) / geometry.width
+    cases = len(flow_rates)
+
+    if barrier_functions is None:
+        barrier_functions = [None] * cases
+    has_barrier = np.array([fn is not None for fn in barrier_functions])
+
+    # Every row's barrier shares one face, and a geometry without barriers has no face to find
+    barrier_idx = None
+    if has_barrier.any():
+        if len(geometry.barrier_x) != 1:
+            raise ValueError("Ensembles model a single barrier per flume")
+        barrier_idx = int(round(geometry.barrier_x[0] / dx))
+
+    zb = np.zeros((cases, N + 2))
+    zb_interface = np.zeros((cases, N + 1))
+    for i, bed_function in enumerate(bed_functions):
+        zb[i], zb_interface[i] = _bed_geometry(bed_function, x_vals, length, well_balanced)
+
+    engine = EnsembleEngine(zb, zb_interface, dx, flow_rates, mannings_functions, barrier_functions, barrier_idx, shared_timestep, integrator, cfl, well_balanced, dtype, geometry.width, geometry.outlet)
+    engine.U[0] = start_depth + zb
+    engine.U[1] = np.where(has_barrier, 0.0, flow_rates)[:, np.newaxis]
+
+    # Same stopping rules as simulate and simulate_barrier, applied per case
+    convergence_threshold = np.where(has_barrier, 1e-4, 5e-5)
+    max_time = np.where(has_barrier, float(barrier_max_time), float(channel_max_time))
+
+    engine.apply_bcs(engine.U)
+
+    if cfl:
+        cfl.start(engine)
+
+    t = np.zeros(cases)
+    profiles = np.zeros((cases, N + 2, 2))
+    active = np.arange(cases)
+
+    while active.size:
+        dt, max_change = engine.step()
+        t[active] += dt
+
+        done = (max_change <= convergence_threshold[active]) | (t[active] >= max_time[active])
+
+        if done.any():
+            profiles[active[done]] = engine.U[:, done].transpose(1, 2, 0)
+
+            keep = ~done
+            active = active[keep]
+            if active.size:
+                engine = engine.retain(keep)
+
+    return t, profiles
+
+def simulate_flumes(flumes: Sequence[Flume], shared_timestep: bool = False) -> list[np.ndarray]:
+    # One engine steps every case, so they must agree on how to integrate
+    schemes = {(flume.integrator, flume.adaptive_cfl, flume.well_balanced, flume.geometry, np.dtype(flume.dtype)) for flume in flumes}
+    if len(schemes) > 1:
+        raise ValueError("Ensemble flumes must share a geometry, integrator, CFL control, reconstruction and precision")
+    integrator, adaptive_cfl, well_balanced, geometry, dtype = schemes.pop()
+
+    barrier_fns = {}
+
+    bed_functions = []
+    barrier_functions = []
+    for flume in flumes:
+        bed_functions.append(lambda x, incline=flume.incline: -incline * x)
+
+        if flume.barriers:
+            _, setup = flume.barriers[0]
+            key = (setup, flume.coeff_velocity, flume.coeff_contraction)
+            if key not in barrier_fns:
+                barrier_fns[key] = flume._get_barrier_table(setup)
+            barrier_functions.append(barrier_fns[key])
+        else:
+            barrier_functions.append(None)
+
+    _, profiles = simulate_ensemble(
+        [flume.flow for flume in flumes],
+        bed_functions,
+        [flume._get_mannings_fn() for flume in flumes],
+        barrier_functions,
+        shared_timestep,
+        integrator,
+        AdaptiveCFL() if adaptive_cfl else None,
+        well_balanced,
+        geometry,
+        dtype,
+    )
+
+    return list(profiles)
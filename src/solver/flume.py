@@ -3,38 +3,76 @@
 # SPDX-License-Identifier: GPL-2.0-only
 
 import numpy as np
-import pandas as pd
 import plotly.express as px
 
-from pathlib import Path
-from .solver import simulate, simulate_barrier
-from typing import Callable
+from .solver import simulate, simulate_barrier, _interpolate_state, _cell_layout, _ghost_layout
+from .steady import simulate_steady
+from .implicit import simulate_implicit
+from .unsteady import simulate_hydrograph
+from .observers import SolverObserver
+from .instrumentation import SolverInstrumentation
+from .checkpoint import SolverCheckpoint
+from .cfl import AdaptiveCFL
+from .mesh import graded_faces
+from .cache import ProfileCache
+from .rating import BarrierRatingTable
+from .friction import FrictionParameters, load_friction_parameters
+from .geometry import FlumeGeometry
+from typing import Callable, Sequence
 
 class Flume:
-    def __init__(self, barrier_setup: str | None, set_flow: float, incline: float):
+    def __init__(self, barrier_setup: str | Sequence[tuple[float, str]] | None, set_flow: float, incline: float, friction: FrictionParameters | None = None, integrator: str = "heun", adaptive_cfl: bool = False, well_balanced: bool = False, resolution: float | None = None, grid_levels: int = 1, refinement: float | None = None, dtype: type = np.float64, geometry: FlumeGeometry | None = None, coeff_velocity: float = 0.98, coeff_contraction: float = np.pi / (np.pi + 2)):
+        geometry = geometry or FlumeGeometry()
+        if resolution is not None:
+            geometry = geometry.replace(resolution=resolution)
+
         self.barrier = barrier_setup
+        self.barriers = self._barrier_layout(barrier_setup, geometry.barrier_x)
+        if self.barriers:
+            geometry = geometry.replace(barrier_x=[x for x, _ in self.barriers])
+
+        self.geometry = geometry
         self.flow = set_flow
         self.incline = incline
+        self.friction = friction
+        self.integrator = integrator
+        self.adaptive_cfl = adaptive_cfl
+        self.well_balanced = well_balanced
+        self.resolution = geometry.resolution
+        self.grid_levels = grid_levels
+        self.refinement = refinement
+        self.dtype = dtype
+        self.coeff_velocity = coeff_velocity
+        self.coeff_contraction = coeff_contraction
 
-    def _get_mannings_fn(self) -> Callable:
-        path = Path("exports/reports/frictionValues.csv")
-        df = pd.read_csv(path)
-        
-        n_bed = df["Bed"].iloc[0]
-        n_wall = df["Wall"].iloc[0]
+    def _barrier_layout(self, barrier_setup: str | Sequence[tuple[float, str]] | None, positions: Sequence[float]) -> list[tuple[float, str]]:
+        if not barrier_setup:
+            return []
 
-        def fn(h):
-            p_bed = 1.0
-            p_wall = 2.0 * h
-            p_total = p_bed + p_wall
+        # A bare setup string fills every barrier position of the geometry; a cascade lists each barrier's position and setup
+        if isinstance(barrier_setup, str):
+            return [(x, barrier_setup) for x in sorted(positions)]
 
-            n_composite = ((p_bed * (n_bed ** 1.5)) + (p_wall * (n_wall ** 1.5))) / p_total
-            
-            return n_composite ** (2 / 3)
+        return sorted((float(x), setup) for x, setup in barrier_setup)
 
-        return fn
+    def _barrier_label(self) -> str | None:
+        if not self.barriers:
+            return None
+        if isinstance(self.barrier, str):
+            return self.barrier
 
-    def _get_barrier_fn(self, barrier_setup: str) -> Callable:
+        return ", ".join(f"{setup} @ {x:g} m" for x, setup in self.barriers)
+
+    def _friction_coefficients(self) -> tuple[float, float]:
+        friction = self._get_mannings_fn()
+        return friction.n_bed, friction.n_wall
+
+    def _get_mannings_fn(self) -> FrictionParameters:
+        if self.friction is None:
+            self.friction = load_friction_parameters()
+        return self.friction
+
+    def _barrier_geometry(self, barrier_setup: str) -> tuple[float, float, float, float, float, float]:
         split_data = list(map(int, barrier_setup.split("-")))
         gap1 = split_data[0] / 1000
         gap2 = split_data[1] / 1000
@@ -49,9 +87,14 @@ class Flume:
         plank2_top = gap1 + plank1 + gap2 + plank2
         plank2_bottom = gap1 + plank1 + gap2
         plank1_top = gap1 + plank1
+
+        return gap1, plank1_top, plank2_bottom, plank2_top, plank3_bottom, plank3_top
+
+    def _get_barrier_fn(self, barrier_setup: str) -> Callable:
+        gap1, plank1_top, plank2_bottom, plank2_top, plank3_bottom, plank3_top = self._barrier_geometry(barrier_setup)
         
-        coeff_contraction = np.pi / (np.pi + 2)
-        coeff_velocity = 0.98
+        coeff_contraction = self.coeff_contraction
+        coeff_velocity = self.coeff_velocity
         coeff_discharge = coeff_contraction * coeff_velocity
         g = 9.80665
 
@@ -152,17 +195,132 @@ class Flume:
 
         return fn
 
-    def simulate(self):
+    def _get_barrier_table(self, barrier_setup: str) -> BarrierRatingTable:
+        gap1, *plank_edges = self._barrier_geometry(barrier_setup)
+
+        # The sluice only starts to discharge once the pond clears its vena contracta
+        sluice_onset = self.coeff_contraction * gap1
+
+        return BarrierRatingTable(self._get_barrier_fn(barrier_setup), [sluice_onset, *plank_edges])
+
+    def simulate(self, observer: SolverObserver | None = None, method: str = "explicit", initial_profile: np.ndarray | None = None, cache: ProfileCache | None = None, instrumentation: SolverInstrumentation | None = None, checkpoint: SolverCheckpoint | None = None):
+        if cache is None:
+            return self._simulate(observer, method, initial_profile, instrumentation, checkpoint)
+
+        # The steady solve never looks at a seed
+        key = cache.key(self, method, "seeded" if initial_profile is not None and method != "steady" else "cold")
+        profile = cache.get(key)
+        if profile is None:
+            profile = self._simulate(observer, method, initial_profile, instrumentation, checkpoint)
+            cache.put(key, profile)
+
+        return profile
+
+    def _simulate(self, observer: SolverObserver | None, method: str, initial_profile: np.ndarray | None, instrumentation: SolverInstrumentation | None = None, checkpoint: SolverCheckpoint | None = None):
         def bed_fn(x):
             return -self.incline * x
         
         manning_fn = self._get_mannings_fn()
 
-        if self.barrier:
-            barrier_fn = self._get_barrier_fn(self.barrier)
-            _, profile = simulate_barrier(self.flow, bed_fn, manning_fn, barrier_fn, self.barrier)
+        # Barriers sharing a setup share a rating table
+        tables = {setup: self._get_barrier_table(setup) for _, setup in self.barriers}
+        barrier_fn = [tables[setup] for _, setup in self.barriers] or None
+
+        # Only the time-marching engines have kernels to time; a stats file from the others would be empty
+        if instrumentation is not None and method not in ("explicit", "local"):
+            raise ValueError("Instrumentation is only supported by the explicit solvers")
+
+        # The steady profile integrates the flow equations directly, with no reconstruction for well_balanced to change
+        if method == "steady":
+            return simulate_steady(self.flow, bed_fn, manning_fn, barrier_fn, self.geometry)
+
+        if method not in ("implicit", "explicit", "local"):
+            raise ValueError(f"Unknown solver method: {method}")
+
+        if method == "implicit" and (self.refinement or np.dtype(self.dtype) != np.float64):
+            raise ValueError("Mesh refinement and reduced precision are only supported by the explicit solvers")
+
+        # Converge on successively halved grids, each seeding the next, and only instrument and checkpoint the target grid
+        profile = initial_profile
+        for level in reversed(range(self.grid_levels)):
+            geometry = self.geometry.replace(resolution=self.resolution * 2**level)
+            refinement = self.refinement * 2**level if self.refinement else None
+            target = level == 0
+
+            profile = self._simulate_grid(
+                observer, method, profile, bed_fn, manning_fn, barrier_fn, geometry, refinement,
+                instrumentation if target else None, checkpoint if target else None,
+            )
+
+        return profile
+
+    def simulate_hydrograph(self, hydrograph: Callable[[float], float] | np.ndarray, duration: float, observer: SolverObserver | None = None, recorder: SolverObserver | None = None, initial_profile: np.ndarray | None = None, cache: ProfileCache | None = None):
+        def bed_fn(x):
+            return -self.incline * x
+
+        manning_fn = self._get_mannings_fn()
+
+        tables = {setup: self._get_barrier_table(setup) for _, setup in self.barriers}
+        barrier_fn = [tables[setup] for _, setup in self.barriers] or None
+
+        # The set flow is the base flow the hydrograph rises from, so its converged profile is the starting state
+        if initial_profile is None:
+            initial_profile = self.simulate(cache=cache)
+
+        geometry = self.geometry
+        faces = self._mesh_faces(bed_fn, manning_fn, barrier_fn, geometry, self.refinement) if self.refinement else None
+        cfl = AdaptiveCFL() if self.adaptive_cfl else None
+
+        _, profile = simulate_hydrograph(hydrograph, duration, bed_fn, manning_fn, barrier_fn, self._barrier_label(), observer, recorder, initial_profile, self.integrator, cfl, self.well_balanced, geometry, faces, self.dtype)
+
+        if faces is not None:
+            profile = self._resample(profile, faces, geometry.length, self.refinement)
+
+        return profile
+
+    def _resample(self, profile: np.ndarray, faces: np.ndarray, length: float, refinement: float) -> np.ndarray:
+        # Hand back a uniform profile at the fine cell size so callers never need the mesh,
+        # with the ghosts wherever the bed put them on both grids
+        _, x_mesh = _cell_layout(length, refinement, faces)
+        _, x_vals = _cell_layout(length, refinement)
+
+        return _interpolate_state(profile, _ghost_layout(x_vals, length, self.well_balanced), length, _ghost_layout(x_mesh, length, self.well_balanced))
+
+    def _mesh_faces(self, bed_fn: Callable, manning_fn: Callable, barrier_fn: list[Callable] | None, geometry: FlumeGeometry, refinement: float) -> np.ndarray:
+        length = geometry.length
+        resolution = geometry.resolution
+        g = 9.81
+
+        barrier_x = [x for x, _ in self.barriers]
+        focus = list(barrier_x)
+
+        # The steady profile is cheap and places any hydraulic jump closely enough to refine around it
+        try:
+            profile = simulate_steady(self.flow, bed_fn, manning_fn, barrier_fn, geometry)
+            _, x_vals = _cell_layout(length, resolution)
+            h = np.maximum(profile[1:-1, 0] - bed_fn(x_vals), 1e-6)
+            supercritical = np.abs(profile[1:-1, 1]) / h > np.sqrt(g * h)
+            focus.extend(x_vals[1:][supercritical[:-1] & ~supercritical[1:]])
+        except (ValueError, RuntimeError) as e:
+            print(f"Steady profile failed while grading the mesh, refining around the barriers only. Error: {e}")
+
+        return graded_faces(length, resolution, refinement, focus, barrier_x)
+
+    def _simulate_grid(self, observer: SolverObserver | None, method: str, initial_profile: np.ndarray | None, bed_fn: Callable, manning_fn: Callable, barrier_fn: list[Callable] | None, geometry: FlumeGeometry, refinement: float | None, instrumentation: SolverInstrumentation | None, checkpoint: SolverCheckpoint | None):
+        if method == "implicit":
+            _, profile = simulate_implicit(self.flow, bed_fn, manning_fn, barrier_fn, self._barrier_label(), observer, initial_profile, self.well_balanced, geometry)
+            return profile
+
+        local_timestep = method == "local"
+        cfl = AdaptiveCFL() if self.adaptive_cfl else None
+        faces = self._mesh_faces(bed_fn, manning_fn, barrier_fn, geometry, refinement) if refinement else None
+
+        if self.barriers:
+            _, profile, _ = simulate_barrier(self.flow, bed_fn, manning_fn, barrier_fn, self._barrier_label(), observer, local_timestep, initial_profile, instrumentation, checkpoint, self.integrator, cfl, self.well_balanced, geometry, faces, self.dtype)
         else:
-            _, profile = simulate(self.flow, bed_fn, manning_fn)
+            _, profile, _ = simulate(self.flow, bed_fn, manning_fn, observer, local_timestep, initial_profile, instrumentation, checkpoint, self.integrator, cfl, self.well_balanced, geometry, faces, self.dtype)
+
+        if faces is not None:
+            profile = self._resample(profile, faces, geometry.length, refinement)
 
         return profile
-        
@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import pandas as pd
+
+from pathlib import Path
+
+class FrictionParameters:
+    def __init__(self, n_bed: float, n_wall: float, bed_bounds: tuple[float, float] | None = None, wall_bounds: tuple[float, float] | None = None):
+        self.n_bed = float(n_bed)
+        self.n_wall = float(n_wall)
+        self.bed_bounds = bed_bounds
+        self.wall_bounds = wall_bounds
+
+        # With R = h / (1 + 2h) the composite n^2 / R^(4/3) folds to (a / h + b)^(4/3); a wider channel divides b by its width
+        self.a = self.n_bed**1.5
+        self.b = 2.0 * self.n_wall**1.5
+
+    def __call__(self, h, width: float = 1.0):
+        p_bed = width
+        p_wall = 2.0 * h
+        p_total = p_bed + p_wall
+
+        n_composite = ((p_bed * self.a) + (p_wall * 0.5 * self.b)) / p_total
+
+        return n_composite ** (2 / 3)
+
+    def __repr__(self):
+        return f"FrictionParameters(n_bed={self.n_bed}, n_wall={self.n_wall})"
+
+_loaded = {}
+
+def load_friction_parameters(reports_dir: Path = Path("exports/reports")) -> FrictionParameters:
+    path = Path(reports_dir) / "frictionValues.csv"
+    ci_path = Path(reports_dir) / "frictionCIValues.csv"
+
+    # Keyed on modification time so a rewritten report is picked up without re-reading on every call
+    key = (str(path.resolve()), path.stat().st_mtime_ns, ci_path.stat().st_mtime_ns if ci_path.exists() else None)
+    if key in _loaded:
+        return _loaded[key]
+
+    df = pd.read_csv(path)
+
+    bed_bounds = None
+    wall_bounds = None
+    if ci_path.exists():
+        ci_df = pd.read_csv(ci_path).set_index("Bound")
+        bed_bounds = (ci_df.loc["Lower", "Bed"], ci_df.loc["Upper", "Bed"])
+        wall_bounds = (ci_df.loc["Lower", "Wall"], ci_df.loc["Upper", "Wall"])
+
+    parameters = FrictionParameters(df["Bed"].iloc[0], df["Wall"].iloc[0], bed_bounds, wall_bounds)
+    _loaded[key] = parameters
+
+    return parameters
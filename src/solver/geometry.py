@@ -0,0 +1,39 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+from typing import Sequence
+
+class FlumeGeometry:
+    def __init__(self, length: float = 12.5, width: float = 1.0, resolution: float = 0.1, barrier_x: Sequence[float] = (5.0,), outlet: str | float = "critical"):
+        if isinstance(outlet, str) and outlet not in ("critical", "free"):
+            raise ValueError(f"Unknown outlet control: {outlet}")
+
+        self.length = float(length)
+        self.width = float(width)
+        self.resolution = float(resolution)
+        self.barrier_x = tuple(float(x) for x in barrier_x)
+
+        # Critical depth over a free overfall, a transmissive free outlet, or a fixed tailwater depth in metres
+        self.outlet = outlet if isinstance(outlet, str) else float(outlet)
+
+    def parameters(self) -> dict:
+        return {
+            "length": self.length,
+            "width": self.width,
+            "resolution": self.resolution,
+            "barrier_x": list(self.barrier_x),
+            "outlet": self.outlet,
+        }
+
+    def replace(self, **changes) -> "FlumeGeometry":
+        return FlumeGeometry(**{**self.parameters(), **changes})
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FlumeGeometry) and self.parameters() == other.parameters()
+
+    def __hash__(self) -> int:
+        return hash((self.length, self.width, self.resolution, self.barrier_x, self.outlet))
+
+    def __repr__(self):
+        return f"FlumeGeometry(length={self.length}, width={self.width}, resolution={self.resolution}, barrier_x={self.barrier_x}, outlet={self.outlet!r})"
@@ -0,0 +1,154 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import numpy as np
+
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+from typing import Callable, Sequence
+from .engine import SolverEngine, g
+from .solver import _interpolate_state, _bed_geometry, _barrier_layout, _cell_layout
+from .geometry import FlumeGeometry
+from .observers import SolverObserver
+from .steady import simulate_steady
+
+# Residual of a cell depends on its neighbours two cells either side (MUSCL slopes plus face states)
+stencil_radius = 2
+
+def _jacobian_pattern(N: int):
+    columns = np.arange(2 * N)
+    cells = columns // 2
+
+    row_cells = cells[:, np.newaxis] + np.arange(-stencil_radius, stencil_radius + 1)
+    valid = ((row_cells >= 0) & (row_cells < N)).repeat(2, axis=1)
+    rows = (2 * np.clip(row_cells, 0, N - 1)[:, :, np.newaxis] + np.array([0, 1])).reshape(2 * N, -1)
+
+    colours = (cells % (2 * stencil_radius + 1)) * 2 + columns % 2
+
+    return rows, valid, colours
+
+def simulate_implicit(
+    flow_rate: float,
+    bed_function: Callable | None,
+    mannings_function: Callable,
+    barrier_function: Callable | Sequence[Callable] | None = None,
+    barrier_label: str | None = None,
+    observer: SolverObserver | None = None,
+    initial_state: np.ndarray | None = None,
+    well_balanced: bool = False,
+    geometry: FlumeGeometry | None = None,
+):
+    geometry = geometry or FlumeGeometry()
+    length = geometry.length
+    start_depth = 0.05
+
+    dx, x_vals = _cell_layout(length, geometry.resolution)
+    N = len(x_vals)
+
+    barrier_x = None
+    barrier_idx = None
+    barrier_functions = None
+    if barrier_function is not None:
+        barrier_x, barrier_functions = _barrier_layout(barrier_function, geometry.barrier_x)
+        barrier_idx = np.round(barrier_x / dx).astype(int)
+
+    x_vals_full = np.concatenate(([0.0], x_vals, [length]))
+
+    zb, zb_interface = _bed_geometry(bed_function, x_vals, length, well_balanced)
+
+    engine = SolverEngine(zb, zb_interface, dx, flow_rate / geometry.width, mannings_function, barrier_functions, barrier_idx, well_balanced=well_balanced, width=geometry.width, outlet=geometry.outlet)
+    engine.U[0] = start_depth + zb
+    engine.U[1] = engine.flow_rate
+
+    # Newton only converges quickly from inside its basin, so start from the gradually varied flow profile
+    if initial_state is not None:
+        engine.U[:] = _interpolate_state(initial_state, x_vals_full, length).T
+    else:
+        try:
+            engine.U[:] = simulate_steady(flow_rate, bed_function, mannings_function, barrier_function, geometry).T
+        except (ValueError, RuntimeError) as e:
+            print(f"Steady profile failed while seeding the implicit solver, starting from the uniform depth instead. Error: {e}")
+    engine.apply_bcs(engine.U)
+
+    convergence_threshold = 1e-8
+    max_iterations = 200
+    cfl = 10.0
+    cfl_max = 1e8
+
+    U_trial = engine.U.copy()
+
+    def residual(x: np.ndarray) -> np.ndarray:
+        U_trial[:, 1:-1] = x.reshape(N, 2).T
+        engine.apply_bcs(U_trial)
+        K = engine.residual(U_trial, engine.K1)
+        return K[:, 1:-1].T.ravel().copy()
+
+    rows, valid, colours = _jacobian_pattern(N)
+    colour_masks = [colours == c for c in range(colours.max() + 1)]
+
+    def jacobian(x: np.ndarray, R: np.ndarray) -> sparse.csc_matrix:
+        eps = 1.5e-8 * np.maximum(np.abs(x), 1e-2)
+        data = np.zeros(rows.shape)
+
+        for mask in colour_masks:
+            R_perturbed = residual(x + np.where(mask, eps, 0.0))
+            data[mask] = (R_perturbed[rows[mask]] - R[rows[mask]]) / eps[mask, np.newaxis]
+
+        cols = np.broadcast_to(np.arange(2 * N)[:, np.newaxis], rows.shape)
+        return sparse.csc_matrix((data[valid], (rows[valid], cols[valid])), shape=(2 * N, 2 * N))
+
+    title = f"SWE Implicit Solver | Flow: {flow_rate * 1000:.0f} l/s"
+    if barrier_label:
+        title += f" | Barrier: {barrier_label}"
+    if observer:
+        observer.start(x_vals_full, zb, title, barrier_x)
+
+    x = engine.U[:, 1:-1].T.ravel().copy()
+    R = residual(x)
+    R_norm = np.linalg.norm(R)
+    # Both continuity and momentum rows have to settle, or a stalled discharge passes as converged
+    max_change = np.max(np.abs(R))
+
+    iteration = 0
+
+    while max_change > convergence_threshold and iteration < max_iterations:
+        # Local pseudo time step from each cell's wave speed, scaled by the SER Courant number
+        h = np.maximum(x[0::2] - zb[1:-1], 1e-6)
+        speed = np.abs(x[1::2] / h) + np.sqrt(g * h)
+        dtau = np.repeat(cfl * dx / speed, 2)
+
+        A = sparse.diags(1.0 / dtau, format="csc") - jacobian(x, R)
+        delta = spsolve(A, R)
+
+        # Keep depths positive by shortening the update where it would dry a cell
+        dh = delta[0::2]
+        shrinking = dh < 0
+        alpha = min(1.0, np.min(0.8 * h[shrinking] / -dh[shrinking], initial=1.0))
+
+        x = x + alpha * delta
+        R_new = residual(x)
+        R_new_norm = np.linalg.norm(R_new)
+
+        # Switched evolution relaxation: grow the pseudo time step as the residual falls
+        cfl = min(cfl * R_norm / max(R_new_norm, 1e-300), cfl_max)
+        cfl = max(cfl, 0.1)
+
+        R, R_norm = R_new, R_new_norm
+        max_change = np.max(np.abs(R))
+        iteration += 1
+
+        if observer and iteration % observer.frequency == 0:
+            observer.update(iteration, float(iteration), U_trial.T, max_change)
+
+    U_trial[:, 1:-1] = x.reshape(N, 2).T
+    engine.apply_bcs(U_trial)
+
+    if observer:
+        observer.finish(iteration, float(iteration), U_trial.T, max_change)
+
+    # An unconverged state must not reach the caller, or it would be cached and reported as the steady profile
+    if max_change > convergence_threshold:
+        raise RuntimeError(f"Implicit solver did not converge in {max_iterations} iterations, residual {max_change:.3g}")
+
+    return iteration, U_trial.T.copy()
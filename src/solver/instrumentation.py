@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import json
+import time
+import numpy as np
+
+from pathlib import Path
+
+class SolverInstrumentation:
+    kernels = {
+        "dynamic_timestep": "dynamic_timestep",
+        "spatial_reconstructor": "spatial_reconstructor",
+        "hll_flux": "hll_flux",
+        "get_source": "get_source",
+        "apply_bcs": "apply_bcs",
+        "apply_barrier_fluxes": "barrier_face_flux",
+    }
+
+    def __init__(self, history_every: int = 100):
+        self.history_every = history_every
+
+        self.kernel_time = {name: 0.0 for name in self.kernels.values()}
+        self.kernel_calls = {name: 0 for name in self.kernels.values()}
+
+        self.steps = 0
+        self.dt_min = np.inf
+        self.dt_max = 0.0
+        self.dt_sum = 0.0
+
+        self.history = {"step": [], "t": [], "dt": [], "cfl": []}
+        self.change_keys = ("max_change_eta", "max_change_q")
+
+        self.integrator = None
+        self.local_timestep = False
+        self.adaptive_cfl = False
+        self.rejected_steps = 0
+
+        self.model_time = 0.0
+        self.converged = False
+        self.wall_start = None
+        self.wall_time = 0.0
+
+    def _timed(self, name: str, kernel):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = kernel(*args, **kwargs)
+            self.kernel_time[name] += time.perf_counter() - start
+            self.kernel_calls[name] += 1
+            return result
+
+        return wrapper
+
+    def attach(self, engine):
+        # Shadow the bound methods on this engine only, so residual() picks up the timed versions
+        for method, name in self.kernels.items():
+            setattr(engine, method, self._timed(name, getattr(engine, method)))
+
+        self.integrator = engine.integrator
+        self.adaptive_cfl = engine.cfl is not None
+
+        # Local time steps converge on the net residuals over each cell's own step, not on rates over one global step
+        self.local_timestep = engine.local_timestep
+        if self.local_timestep:
+            self.change_keys = ("continuity_residual", "momentum_residual")
+        for key in self.change_keys:
+            self.history[key] = []
+        self.wall_start = time.perf_counter()
+
+    def record_step(self, step: int, t: float, dt: float, max_change: float, engine):
+        self.steps += 1
+
+        # The CFL controller rolled this step back, so it never advanced the solution
+        if dt == 0:
+            self.rejected_steps += 1
+            return
+
+        self.dt_min = min(self.dt_min, dt)
+        self.dt_max = max(self.dt_max, dt)
+        self.dt_sum += dt
+
+        if step % self.history_every == 0:
+            self._record_history(step, t, dt, max_change, engine)
+
+    def _record_history(self, step: int, t: float, dt: float, max_change: float, engine):
+        if self.local_timestep:
+            change_q = float(np.max(np.abs(engine.U[1, ..., 1:-1] - engine.U_n[1, ..., 1:-1]) / engine.local_dt[..., 1:-1]))
+        else:
+            change_q = float(np.max(np.abs(engine.U[1] - engine.U_n[1])) / dt)
+
+        key_eta, key_q = self.change_keys
+        self.history["step"].append(int(step))
+        self.history["t"].append(float(t))
+        self.history["dt"].append(float(dt))
+        self.history["cfl"].append(float(np.min(engine.courant)))
+        self.history[key_eta].append(float(max_change))
+        self.history[key_q].append(change_q)
+
+    def finish(self, step: int, t: float, dt: float, max_change: float, converged: bool, engine):
+        if step and dt > 0 and (step - 1) % self.history_every != 0:
+            self._record_history(step - 1, t, dt, max_change, engine)
+
+        self.model_time = float(t)
+        self.converged = bool(converged)
+        if self.wall_start is not None:
+            self.wall_time = time.perf_counter() - self.wall_start
+
+    def summary(self) -> dict:
+        accepted = self.steps - self.rejected_steps
+
+        return {
+            "integrator": self.integrator,
+            "adaptive_cfl": self.adaptive_cfl,
+            "local_timestep": self.local_timestep,
+            "steps": self.steps,
+            "rejected_steps": self.rejected_steps,
+            "model_time": self.model_time,
+            "wall_time": self.wall_time,
+            "converged": self.converged,
+            "kernels": {
+                name: {"calls": self.kernel_calls[name], "time": self.kernel_time[name]}
+                for name in self.kernel_time
+            },
+            "dt": {
+                "min": float(self.dt_min) if accepted else None,
+                "max": float(self.dt_max) if accepted else None,
+                "mean": self.dt_sum / accepted if accepted else None,
+            },
+            "history": self.history,
+        }
+
+    def write(self, path: Path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
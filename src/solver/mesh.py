@@ -0,0 +1,31 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import numpy as np
+
+def graded_faces(length: float, resolution: float, refinement: float, focus: list[float], anchors: list[float] = (), zone: float = 0.25, growth: float = 0.1) -> np.ndarray:
+    focus = np.asarray(focus, dtype=float)
+
+    def size(x: float) -> float:
+        # Fine cells across each zone, then widening by a fixed fraction per cell out to the coarse size
+        distance = np.min(np.abs(focus - x)) if focus.size else np.inf
+        return min(resolution, refinement + growth * max(distance - zone, 0.0))
+
+    edges = [0.0, *sorted(a for a in anchors if 0.0 < a < length), length]
+    faces = [0.0]
+
+    for start, end in zip(edges[:-1], edges[1:]):
+        segment = [start]
+        while segment[-1] < end:
+            segment.append(segment[-1] + size(segment[-1]))
+
+        # Drop a sliver last cell, then stretch the segment so its last face lands on the anchor
+        if len(segment) > 2 and (end - segment[-2]) < 0.5 * (segment[-1] - segment[-2]):
+            segment.pop()
+        segment = np.asarray(segment)
+        segment = start + (segment - start) * (end - start) / (segment[-1] - start)
+
+        faces.extend(segment[1:])
+
+    return np.array(faces)
@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import json
+import numpy as np
+import matplotlib.pyplot as plt
+
+from pathlib import Path
+from typing import Sequence
+
+class SolverObserver:
+    def __init__(self, frequency: int = 100):
+        self.frequency = frequency
+
+    def start(self, x: np.ndarray, zb: np.ndarray, title: str, barrier_x: float | Sequence[float] | None = None):
+        pass
+
+    def update(self, step: int, t: float, Q: np.ndarray, max_change: float):
+        pass
+
+    def finish(self, step: int, t: float, Q: np.ndarray, max_change: float):
+        pass
+
+class LivePlotObserver(SolverObserver):
+    def start(self, x: np.ndarray, zb: np.ndarray, title: str, barrier_x: float | Sequence[float] | None = None):
+        self.zb = zb
+
+        plt.ion()
+        self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
+        self.fig.suptitle(title)
+
+        # The water line stays empty until the first update rather than starting on the bed
+        self.line_eta, = self.ax1.plot(x, np.full_like(zb, np.nan), label="Water Elevation (eta)", color="blue", lw=2)
+        self.ax1.plot(x, zb, label="Bed Elevation (zb)", color="black", lw=2, linestyle='--')
+        barriers = np.atleast_1d(barrier_x) if barrier_x is not None else []
+        for i, x_b in enumerate(barriers):
+            self.ax1.axvline(x_b, color='red', lw=1.5, alpha=0.7, linestyle=':', label='Barrier' if i == 0 else None)
+        self.ax1.set_ylabel("Elevation (m)")
+        self.ax1.legend()
+        self.ax1.grid(True, linestyle=':', alpha=0.6)
+
+        self.line_u, = self.ax2.plot(x, np.zeros_like(x), label="Velocity (u)", color="red", lw=2)
+        for x_b in barriers:
+            self.ax2.axvline(x_b, color='red', lw=1.5, alpha=0.7, linestyle=':')
+        self.ax2.set_xlabel("Distance along flume (m)")
+        self.ax2.set_ylabel("Velocity (m/s)")
+        self.ax2.legend()
+        self.ax2.grid(True, linestyle=':', alpha=0.6)
+
+    def update(self, step: int, t: float, Q: np.ndarray, max_change: float):
+        eta = Q[:, 0]
+        h = np.maximum(eta - self.zb, 0.0)
+        u = np.divide(Q[:, 1], h, out=np.zeros_like(h), where=h > 1e-4)
+
+        self.line_eta.set_ydata(eta)
+        self.line_u.set_ydata(u)
+
+        self.ax1.relim()
+        self.ax1.autoscale_view()
+        self.ax2.relim()
+        self.ax2.autoscale_view()
+        self.ax1.set_title(f"Time: {t:.2f} s | Max Change: {max_change:.6f}")
+
+        self.fig.canvas.draw()
+        self.fig.canvas.flush_events()
+
+    def finish(self, step: int, t: float, Q: np.ndarray, max_change: float):
+        plt.ioff()
+        plt.close(self.fig)
+
+class JsonLinesObserver(SolverObserver):
+    def __init__(self, path: Path, frequency: int = 100):
+        super().__init__(frequency)
+        self.path = Path(path)
+        self.title = None
+
+    def _write(self, record: dict):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def start(self, x: np.ndarray, zb: np.ndarray, title: str, barrier_x: float | Sequence[float] | None = None):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.title = title
+        self._write({"case": title, "event": "start", "cells": len(x)})
+
+    def update(self, step: int, t: float, Q: np.ndarray, max_change: float):
+        self._write({"case": self.title, "event": "update", "step": step, "t": float(t), "max_change": float(max_change)})
+
+    def finish(self, step: int, t: float, Q: np.ndarray, max_change: float):
+        self._write({"case": self.title, "event": "finish", "step": step, "t": float(t), "max_change": float(max_change)})
@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import copy
+import numpy as np
+
+from typing import Callable, Sequence
+
+class BarrierRatingTable:
+    def __init__(self, barrier_function: Callable, breakpoints: Sequence[float], h_max: float = 2.0, resolution: float = 2e-4):
+        self.barrier_function = barrier_function
+
+        # Regions switch on and off at the breakpoints with square-root or 1.5-power onsets,
+        # so pin the table either side of each one and grade the spacing just above it
+        edges = np.asarray([b for b in breakpoints if 0.0 < b < h_max])
+        graded = (edges[:, np.newaxis] + resolution * np.logspace(-6, 0, 25)).ravel()
+        h = np.concatenate((np.arange(0.0, h_max + resolution, resolution), edges, edges - 1e-9, graded))
+
+        self.h = np.unique(h)
+        self.h_max = self.h[-1]
+        self.q, self.M = barrier_function(self.h, np.zeros_like(self.h))
+
+    def __call__(self, h, ds):
+        if np.ndim(h) == 0:
+            if h > self.h_max:
+                return self.barrier_function(h, ds)
+            return np.interp(h, self.h, self.q), np.interp(h, self.h, self.M)
+
+        q = np.interp(h, self.h, self.q)
+        M = np.interp(h, self.h, self.M)
+
+        above = h > self.h_max
+        if above.any():
+            q[above], M[above] = self.barrier_function(h[above], ds[above])
+
+        return q, M
+
+class BatchedBarrierRating:
+    def __init__(self, tables: Sequence[BarrierRatingTable]):
+        self.tables = list(tables)
+
+        # Rows that share a table share one copy of it, so the axis grows with the distinct setups, not the rows
+        distinct = {}
+        self.table_index = np.array([distinct.setdefault(id(table), len(distinct)) for table in self.tables], dtype=int)
+        unique_tables = [self.tables[i] for i in np.unique(self.table_index, return_index=True)[1]]
+
+        # Lay the tables end to end on one axis so a single interpolation serves every row
+        spans = np.array([table.h_max + 1.0 for table in unique_tables])
+        table_offsets = np.concatenate(([0.0], np.cumsum(spans)[:-1]))
+        table_h_max = np.array([table.h_max for table in unique_tables])
+
+        self.h = np.concatenate([table.h + offset for table, offset in zip(unique_tables, table_offsets)])
+        self.q = np.concatenate([table.q for table in unique_tables])
+        self.M = np.concatenate([table.M for table in unique_tables])
+
+        self.offsets = table_offsets[self.table_index]
+        self.h_max = table_h_max[self.table_index]
+
+    def __call__(self, h: np.ndarray, ds: np.ndarray):
+        h_shifted = np.minimum(h, self.h_max) + self.offsets
+
+        q = np.interp(h_shifted, self.h, self.q)
+        M = np.interp(h_shifted, self.h, self.M)
+
+        for i in np.flatnonzero(h > self.h_max):
+            q[i], M[i] = self.tables[i].barrier_function(h[i], ds[i])
+
+        return q, M
+
+    def retain(self, rows: np.ndarray) -> "BatchedBarrierRating":
+        # The shared axis is left as it is; only the rows that still look it up are narrowed
+        rating = copy.copy(self)
+        rating.tables = [self.tables[i] for i in rows]
+        rating.table_index = self.table_index[rows]
+        rating.offsets = self.offsets[rows]
+        rating.h_max = self.h_max[rows]
+
+        return rating
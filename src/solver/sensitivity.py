@@ -0,0 +1,113 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import os
+import numpy as np
+import pandas as pd
+
+from pathlib import Path
+from scipy.stats import qmc
+from src.analysis.data_processing import flow_half_width
+from .flume import Flume
+from .friction import FrictionParameters, load_friction_parameters
+from .validation import _solve, _profile_table
+
+def _input_bounds(friction: FrictionParameters, flow_ls: float, coeff_velocity: float, coeff_contraction: float) -> dict[str, tuple[float, float]]:
+    # Same flow meter uncertainty as the Monte Carlo analysis
+    flow_error = flow_half_width(flow_ls)
+
+    # Neither coefficient can exceed one
+    return {
+        "Bed n": friction.bed_bounds or (0.8 * friction.n_bed, 1.2 * friction.n_bed),
+        "Wall n": friction.wall_bounds or (0.8 * friction.n_wall, 1.2 * friction.n_wall),
+        "Velocity Coefficient": (0.97 * coeff_velocity, min(1.02 * coeff_velocity, 1.0)),
+        "Contraction Coefficient": (0.9 * coeff_contraction, min(1.1 * coeff_contraction, 1.0)),
+        "Inflow Error (l/s)": (-flow_error, flow_error),
+    }
+
+def _sobol_indices(f_A: np.ndarray, f_B: np.ndarray, f_AB: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Saltelli (2010) first order and Jansen (1999) total order, centred on the mean as scipy's sobol_indices does,
+    # but over however many rows are given rather than only a power of two
+    mean = np.mean([f_A, f_B])
+    f_A, f_B, f_AB = f_A - mean, f_B - mean, f_AB - mean
+    var = np.var([f_A, f_B])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        first_order = np.mean(f_B * (f_AB - f_A), axis=-1) / var
+        total_order = 0.5 * np.mean((f_A - f_AB) ** 2, axis=-1) / var
+
+    # An output that never varies has nothing to apportion
+    first_order[~np.isfinite(first_order)] = 0.0
+    total_order[~np.isfinite(total_order)] = 0.0
+
+    return first_order, total_order
+
+def _upstream_depth(profile: np.ndarray, flume: Flume) -> float:
+    table = _profile_table(profile, flume.incline, flume.geometry.length)
+    upstream = table[:, 0] < flume.barriers[0][0]
+
+    return table[upstream, 1][-1]
+
+def barrier_sensitivity(barrier_setup: str, flow_ls: float, samples: int = 256, friction: FrictionParameters | None = None, coeff_velocity: float = 0.98, coeff_contraction: float = np.pi / (np.pi + 2), method: str = "steady", workers: int | None = 1, seed: int | None = None, **flume_options) -> pd.DataFrame:
+    # The Sobol sequence only keeps its balance properties at powers of two
+    if samples < 2 or samples & (samples - 1):
+        raise ValueError(f"The sample size must be a power of two, not {samples}")
+
+    friction = friction or load_friction_parameters()
+    bounds = _input_bounds(friction, flow_ls, coeff_velocity, coeff_contraction)
+    d = len(bounds)
+
+    # Saltelli's scheme: two independent quasi-random matrices, plus one copy of A per input with that column from B
+    sample = qmc.Sobol(2 * d, rng=seed).random(samples)
+    lower, upper = np.array(list(bounds.values())).T
+    A = qmc.scale(sample[:, :d], lower, upper)
+    B = qmc.scale(sample[:, d:], lower, upper)
+    AB = np.tile(A, (d, 1, 1))
+    for i in range(d):
+        AB[i, :, i] = B[:, i]
+
+    points = np.concatenate([A, B, AB.reshape(-1, d)])
+    flumes = [
+        Flume(barrier_setup, (flow_ls + error) / 1000.0, 0.0, FrictionParameters(n_bed, n_wall), coeff_velocity=cv, coeff_contraction=cc, **flume_options)
+        for n_bed, n_wall, cv, cc, error in points
+    ]
+
+    # Every solve is independent, so hand each worker an even share in one batch
+    workers = workers or os.cpu_count()
+    results = _solve(flumes, None, False, workers, -(-len(flumes) // workers), method)
+
+    depths = np.array([np.nan if isinstance(result, Exception) else _upstream_depth(result, flume) for flume, result in zip(flumes, results)])
+
+    f_A, f_B, f_AB = depths[:samples], depths[samples:2 * samples], depths[2 * samples:].reshape(d, samples)
+
+    # The estimators pair each row of A with the same row of B and every AB, so a failed run drops its whole row
+    kept = np.isfinite(f_A) & np.isfinite(f_B) & np.isfinite(f_AB).all(axis=0)
+    if not kept.any():
+        raise RuntimeError(f"Every sensitivity run failed for {barrier_setup} at {flow_ls} l/s")
+    first_order, total_order = _sobol_indices(f_A[kept], f_B[kept], f_AB[:, kept])
+
+    return pd.DataFrame({
+        "Barrier Setup": barrier_setup,
+        "Set Flow (l/s)": flow_ls,
+        "Input": list(bounds),
+        "Lower Bound": lower,
+        "Upper Bound": upper,
+        "First Order": first_order,
+        "Total Order": total_order,
+        "Mean Upstream Depth (mm)": np.nanmean(depths),
+        "Failed Runs": int(np.isnan(depths).sum()),
+    })
+
+def write_sensitivity_report(report_directory: Path, data: pd.DataFrame | None = None, **options) -> pd.DataFrame:
+    if data is None:
+        data = pd.read_csv(Path("data/BarrierExperiments.csv"))
+
+    cases = [key for key, _ in data.groupby(["Barrier Setup", "Set Flow (l/s)"])]
+    results = pd.concat([barrier_sensitivity(barrier_setup, flow_ls, **options) for barrier_setup, flow_ls in cases], ignore_index=True)
+
+    report_directory = Path(report_directory)
+    report_directory.mkdir(parents=True, exist_ok=True)
+    results.to_csv(report_directory / "SensitivityIndices.csv", index=False)
+
+    return results
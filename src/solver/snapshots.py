@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import numpy as np
+
+from pathlib import Path
+from typing import Sequence
+from .observers import SolverObserver
+
+def _times_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}_times.npy")
+
+def _positions_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}_x.npy")
+
+class SnapshotRecorder(SolverObserver):
+    def __init__(self, path: Path, capacity: int = 1000, interval: float | None = None, threshold: float | None = None, frequency: int = 1):
+        super().__init__(frequency)
+        self.path = Path(path)
+        self.capacity = capacity
+        self.interval = interval
+        self.threshold = threshold
+        self.states = None
+        self.times = None
+        self.eta_change = None
+        self.count = 0
+
+    def start(self, x: np.ndarray, zb: np.ndarray, title: str, barrier_x: float | Sequence[float] | None = None):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Both files are sized up front and written in place, so the history never has to fit in memory
+        self.states = np.lib.format.open_memmap(self.path, mode="w+", dtype=np.float64, shape=(self.capacity, len(x), 2))
+        self.times = np.lib.format.open_memmap(_times_path(self.path), mode="w+", dtype=np.float64, shape=(self.capacity,))
+        self.times[:] = np.nan
+        # A refined run records on its graded mesh, so the cell centres go alongside the states
+        np.save(_positions_path(self.path), np.asarray(x, dtype=np.float64))
+        self.eta_change = np.zeros(len(x))
+        self.count = 0
+
+    def _due(self, t: float, Q: np.ndarray) -> bool:
+        if self.count == 0:
+            return True
+        if self.interval is None and self.threshold is None:
+            return True
+
+        if self.interval is not None and t >= self.times[self.count - 1] + self.interval:
+            return True
+
+        if self.threshold is not None:
+            np.subtract(Q[:, 0], self.states[self.count - 1, :, 0], out=self.eta_change)
+            np.abs(self.eta_change, out=self.eta_change)
+            if self.eta_change.max() >= self.threshold:
+                return True
+
+        return False
+
+    def _decimate(self):
+        # A full record keeps every other snapshot and halves its sampling rate, so a run of any length still fits
+        kept = (self.count + 1) // 2
+        self.states[:kept] = self.states[:self.count:2]
+        self.times[:kept] = self.times[:self.count:2]
+        self.times[kept:] = np.nan
+        self.count = kept
+
+        if self.interval is not None:
+            self.interval *= 2
+        if self.threshold is not None:
+            self.threshold *= 2
+        if self.interval is None and self.threshold is None:
+            self.frequency *= 2
+
+    def _record(self, t: float, Q: np.ndarray):
+        if self.count == self.capacity:
+            self._decimate()
+
+        self.states[self.count] = Q
+        self.times[self.count] = t
+        self.count += 1
+
+    def update(self, step: int, t: float, Q: np.ndarray, max_change: float):
+        if self._due(t, Q):
+            self._record(t, Q)
+
+    def finish(self, step: int, t: float, Q: np.ndarray, max_change: float):
+        if self.count == 0 or self.times[self.count - 1] != t:
+            self._record(t, Q)
+
+        self.states.flush()
+        self.times.flush()
+
+def load_snapshots(path: Path) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    path = Path(path)
+    times = np.load(_times_path(path), mmap_mode="r")
+    states = np.load(path, mmap_mode="r")
+    x = np.load(_positions_path(path))
+
+    # Unused slots are left as NaN times at the end of the record
+    count = int(np.count_nonzero(~np.isnan(times)))
+
+    return times[:count], states[:count], x
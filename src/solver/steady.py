@@ -0,0 +1,164 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import numpy as np
+
+from scipy.integrate import solve_ivp
+from scipy.optimize import brentq
+from typing import Callable, Sequence
+from .solver import _barrier_layout, _cell_layout
+from .friction import FrictionParameters
+from .geometry import FlumeGeometry
+
+g = 9.81
+critical_margin = 1e-3
+
+def _specific_force(h: np.ndarray, q: float) -> np.ndarray:
+    return q * q / (g * h) + 0.5 * h * h
+
+def _friction_slope(h: float, q: float, mannings_function: Callable, width: float = 1.0) -> float:
+    n = mannings_function(h, width) if isinstance(mannings_function, FrictionParameters) else mannings_function(h)
+    R = h / (1 + 2 * h / width)
+    return (n * n * q * q) / (h * h * R**(4/3))
+
+def _bed_slope(x: float, bed_function: Callable | None) -> float:
+    if not bed_function:
+        return 0.0
+    dx = 1e-6
+    return -(bed_function(x + dx) - bed_function(x - dx)) / (2 * dx)
+
+def _normal_depth(q: float, slope: float, mannings_function: Callable, width: float = 1.0) -> float | None:
+    if slope <= 0.0:
+        return None
+
+    h_hi = 0.01
+    while _friction_slope(h_hi, q, mannings_function, width) > slope:
+        h_hi *= 2
+
+    return brentq(lambda h: _friction_slope(h, q, mannings_function, width) - slope, 1e-6, h_hi)
+
+def _rated_head(q: float, barrier_function: Callable) -> float:
+    h_hi = 0.05
+    while barrier_function(h_hi, 0.0)[0] < q:
+        h_hi *= 2
+
+    return brentq(lambda h: barrier_function(h, 0.0)[0] - q, 1e-9, h_hi, xtol=1e-12)
+
+def _gvf_branch(h0: float, x0: float, x_eval: np.ndarray, q: float, bed_function: Callable | None, mannings_function: Callable, width: float = 1.0) -> np.ndarray:
+    h = np.full(len(x_eval), np.nan)
+    if len(x_eval) == 0:
+        return h
+
+    def dh_dx(x, y):
+        depth = max(y[0], 1e-6)
+        froude_sq = q * q / (g * depth**3)
+        return [(_bed_slope(x, bed_function) - _friction_slope(depth, q, mannings_function, width)) / (1 - froude_sq)]
+
+    def near_critical(x, y):
+        return abs(1 - q * q / (g * max(y[0], 1e-6)**3)) - critical_margin
+    near_critical.terminal = True
+
+    sol = solve_ivp(dh_dx, (x0, x_eval[-1]), [h0], t_eval=x_eval, events=near_critical, rtol=1e-8, atol=1e-10)
+
+    # A branch that reaches critical before the first cell centre comes back with no states at all
+    if len(sol.t):
+        h[:len(sol.t)] = sol.y[0]
+
+    return h
+
+def _solve_reach(x: np.ndarray, x_up: float, x_down: float, h_supercritical: float | None, h_control: float, q: float, bed_function: Callable | None, mannings_function: Callable, width: float = 1.0, supercritical_exit: bool = False) -> np.ndarray:
+    h_c = (q * q / g)**(1/3)
+
+    # Supercritical branch from the upstream inflow, subcritical branch from the downstream control
+    supercritical = np.full(len(x), np.nan)
+    if h_supercritical is not None and h_supercritical < h_c * (1 - critical_margin):
+        supercritical = _gvf_branch(h_supercritical, x_up, x, q, bed_function, mannings_function, width)
+    has_sup = ~np.isnan(supercritical)
+
+    # A control that passes supercritical flow straight out cannot force a jump on flow that reaches it that way
+    subcritical = np.full(len(x), np.nan)
+    if h_control > h_c * (1 - critical_margin) and not (supercritical_exit and len(x) and has_sup[-1]):
+        h_start = max(h_control, h_c * (1 + critical_margin))
+        subcritical = _gvf_branch(h_start, x_down, x[::-1], q, bed_function, mannings_function, width)[::-1]
+    has_sub = ~np.isnan(subcritical)
+
+    # Hydraulic jump at the first cell where the subcritical specific force matches the jet's
+    with np.errstate(invalid="ignore"):
+        jumped = has_sub & (~has_sup | (_specific_force(subcritical, q) >= _specific_force(supercritical, q)))
+    jump_idx = np.argmax(jumped) if jumped.any() else len(x)
+
+    h = np.where(has_sub, subcritical, h_c)
+    h[:jump_idx] = np.where(has_sup[:jump_idx], supercritical[:jump_idx], h[:jump_idx])
+
+    return h
+
+def simulate_steady(flow_rate: float, bed_function: Callable | None, mannings_function: Callable, barrier_function: Callable | Sequence[Callable] | None = None, geometry: FlumeGeometry | None = None) -> np.ndarray:
+    geometry = geometry or FlumeGeometry()
+    length = geometry.length
+    width = geometry.width
+
+    _, x_vals = _cell_layout(length, geometry.resolution)
+    N = len(x_vals)
+    x_vals_full = np.concatenate(([0.0], x_vals, [length]))
+
+    if bed_function:
+        zb = bed_function(x_vals_full)
+    else:
+        zb = np.zeros(N + 2)
+
+    q = flow_rate / width
+    h_c = (q * q / g)**(1/3)
+
+    # Same outlet stage as the ghost cell in apply_bcs; a free outlet passes uniform flow out where the bed allows it
+    if geometry.outlet == "critical":
+        h_outlet = h_c - zb[-1]
+    elif geometry.outlet == "free":
+        h_outlet = _normal_depth(q, _bed_slope(length, bed_function), mannings_function, width) or h_c
+    else:
+        h_outlet = geometry.outlet
+
+    # On a steep bed the inflow passes through critical depth and draws down towards normal depth
+    h_normal = _normal_depth(q, _bed_slope(0.0, bed_function), mannings_function, width)
+    h_inflow = h_c * (1 - 2 * critical_margin) if h_normal is not None and h_normal < h_c else None
+
+    # Explicit runs start 5 cm deep; apply_bcs leaves a critical outlet transmissive if that start is already supercritical there
+    start_depth = 0.05
+    supercritical_exit = geometry.outlet == "critical" and start_depth < h_c
+
+    h = np.zeros(N)
+
+    if barrier_function is None:
+        h[:] = _solve_reach(x_vals, 0.0, length, h_inflow, h_outlet, q, bed_function, mannings_function, width, supercritical_exit)
+    else:
+        # Barrier runs start from still water, so the outlet holds its control before the jet ever reaches it
+        barrier_x, barrier_functions = _barrier_layout(barrier_function, geometry.barrier_x)
+        edges = np.concatenate(([0.0], barrier_x, [length]))
+
+        # Each barrier holds its rated head upstream and throws a jet into the reach below it
+        heads = [_rated_head(q, fn) for fn in barrier_functions]
+        jets = []
+        for fn, h_upstream in zip(barrier_functions, heads):
+            _, M_jet = fn(h_upstream, 0.0)
+            jets.append(q * q / M_jet if M_jet > 0 else None)
+
+        # Ratings are free flow, so each reach runs from the jet of the barrier above to the head of the one below
+        controls = [*heads, h_outlet]
+        supercritical = [h_inflow, *jets]
+        for i in range(len(edges) - 1):
+            reach = (x_vals >= edges[i]) & (x_vals < edges[i + 1])
+            h[reach] = _solve_reach(x_vals[reach], edges[i], edges[i + 1], supercritical[i], controls[i], q, bed_function, mannings_function, width)
+
+    Q_array = np.zeros((N + 2, 2))
+    Q_array[1:-1, 0] = zb[1:-1] + h
+    Q_array[:, 1] = q
+
+    Q_array[0, 0] = Q_array[1, 0] - zb[1] + zb[0]
+    if geometry.outlet == "free" or (geometry.outlet == "critical" and h[-1] < h_c):
+        Q_array[-1, 0] = Q_array[-2, 0] - zb[-2] + zb[-1]
+    elif geometry.outlet == "critical":
+        Q_array[-1, 0] = h_c
+    else:
+        Q_array[-1, 0] = zb[-1] + geometry.outlet
+
+    return Q_array
@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import numpy as np
+import pandas as pd
+
+from pathlib import Path
+from typing import Iterator
+
+class ResultsStore:
+    columns = ["X Position (m)", "Depth (mm)", "Velocity (m/s)"]
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.profiles_path = self.directory / "profiles.f64"
+        self.index_path = self.directory / "index.csv"
+
+    def clear(self):
+        self.profiles_path.unlink(missing_ok=True)
+        self.index_path.unlink(missing_ok=True)
+
+    def append(self, params: dict, data: np.ndarray):
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        data = np.ascontiguousarray(data, dtype=np.float64)
+        offset = self.profiles_path.stat().st_size // (8 * len(self.columns)) if self.profiles_path.exists() else 0
+
+        with open(self.profiles_path, "ab") as f:
+            data.tofile(f)
+
+        row = pd.DataFrame([{**params, "Offset": offset, "Count": len(data)}])
+        row.to_csv(self.index_path, mode="a", header=not self.index_path.exists(), index=False)
+
+    def index(self) -> pd.DataFrame:
+        if not self.index_path.exists():
+            return pd.DataFrame(columns=["Offset", "Count"])
+
+        # Later appends of the same case supersede earlier ones
+        index = pd.read_csv(self.index_path)
+        params = [c for c in index.columns if c not in ("Offset", "Count")]
+
+        return index.drop_duplicates(subset=params, keep="last").reset_index(drop=True)
+
+    def profiles(self) -> np.ndarray:
+        if not self.profiles_path.exists() or self.profiles_path.stat().st_size == 0:
+            return np.zeros((0, len(self.columns)))
+
+        return np.memmap(self.profiles_path, dtype=np.float64, mode="r").reshape(-1, len(self.columns))
+
+    def get(self, params: dict) -> np.ndarray | None:
+        index = self.index()
+        if index.empty:
+            return None
+
+        match = np.ones(len(index), dtype=bool)
+        for key, value in params.items():
+            match &= (index[key] == value).to_numpy()
+
+        if not match.any():
+            return None
+
+        offset, count = index.loc[np.flatnonzero(match)[-1], ["Offset", "Count"]].astype(int)
+
+        return self.profiles()[offset:offset + count]
+
+    def cases(self, keys: list[str]) -> dict[tuple, np.ndarray]:
+        return {tuple(params[key] for key in keys): data for params, data in self}
+
+    def __iter__(self) -> Iterator[tuple[dict, np.ndarray]]:
+        profiles = self.profiles()
+
+        for record in self.index().to_dict("records"):
+            offset, count = int(record.pop("Offset")), int(record.pop("Count"))
+            yield record, profiles[offset:offset + count]
+
+    def export_csv(self, data: np.ndarray, path: Path):
+        pd.DataFrame(np.asarray(data), columns=self.columns).to_csv(path, index=False)
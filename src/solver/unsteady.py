@@ -0,0 +1,89 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import numpy as np
+
+from typing import Callable, Sequence
+from .engine import SolverEngine
+from .observers import SolverObserver
+from .cfl import AdaptiveCFL
+from .geometry import FlumeGeometry
+from .solver import _barrier_layout, _bed_geometry, _cell_layout, _interpolate_state
+from .steady import simulate_steady
+
+def _hydrograph_function(hydrograph: Callable[[float], float] | np.ndarray) -> Callable[[float], float]:
+    if callable(hydrograph):
+        return hydrograph
+
+    # A table of (time, flow) rows is interpolated linearly and held at its end values
+    table = np.asarray(hydrograph, dtype=float)
+    if table.ndim != 2 or table.shape[1] != 2:
+        raise ValueError("A hydrograph table needs (time, flow) rows")
+
+    return lambda t: float(np.interp(t, table[:, 0], table[:, 1]))
+
+def simulate_hydrograph(hydrograph: Callable[[float], float] | np.ndarray, duration: float, bed_function: Callable | None, mannings_function: Callable, barrier_function: Callable | Sequence[Callable] | None = None, barrier_label: str | None = None, observer: SolverObserver | None = None, recorder: SolverObserver | None = None, initial_state: np.ndarray | None = None, integrator: str = "heun", cfl: AdaptiveCFL | None = None, well_balanced: bool = False, geometry: FlumeGeometry | None = None, faces: np.ndarray | None = None, dtype: type = np.float64):
+    geometry = geometry or FlumeGeometry()
+    length = geometry.length
+    inflow = _hydrograph_function(hydrograph)
+
+    dx, x_vals = _cell_layout(length, geometry.resolution, faces)
+    x_vals_full = np.concatenate(([0.0], x_vals, [length]))
+
+    barrier_x, barrier_idx, barrier_functions = None, None, None
+    if barrier_function is not None:
+        barrier_x, barrier_functions = _barrier_layout(barrier_function, geometry.barrier_x)
+        if faces is None:
+            barrier_idx = np.round(barrier_x / dx).astype(int)
+        else:
+            barrier_idx = np.argmin(np.abs(faces[:, np.newaxis] - barrier_x), axis=0)
+
+    zb, zb_interface = _bed_geometry(bed_function, x_vals, length, well_balanced, faces)
+
+    # Without a starting profile the run begins from the steady flow at the opening discharge
+    if initial_state is None:
+        initial_state = simulate_steady(inflow(0.0), bed_function, mannings_function, barrier_function, geometry)
+
+    engine = SolverEngine(zb, zb_interface, dx, inflow(0.0) / geometry.width, mannings_function, barrier_functions, barrier_idx, False, integrator, cfl, well_balanced, dtype, geometry.width, geometry.outlet)
+    engine.U[:] = _interpolate_state(initial_state, x_vals_full, length).T
+    Q_array = engine.U.T
+
+    t = 0.0
+    max_change = 0.0
+
+    engine.apply_bcs(engine.U)
+
+    if cfl:
+        cfl.start(engine)
+
+    title = f"SWE Solver | Hydrograph: {duration:g} s"
+    if barrier_label:
+        title += f" | Barrier: {barrier_label}"
+
+    watchers = [w for w in (observer, recorder) if w is not None]
+    for watcher in watchers:
+        watcher.start(x_vals_full, zb, title, barrier_x)
+        watcher.update(0, t, Q_array, max_change)
+
+    step = 0
+    dt = 0.0
+
+    while t < duration:
+        # The inflow is held over each step at its value at the start of the step
+        engine.flow_rate = inflow(t) / geometry.width
+
+        # The last step is shortened to land on the duration rather than run past it
+        remaining = duration - t
+        dt, max_change = engine.step(remaining)
+        t = duration if dt >= remaining else t + dt
+        step += 1
+
+        for watcher in watchers:
+            if step % watcher.frequency == 0:
+                watcher.update(step, t, Q_array, max_change)
+
+    for watcher in watchers:
+        watcher.finish(step, t, Q_array, max_change)
+
+    return t, Q_array.astype(np.float64)
@@ -2,92 +2,264 @@
 #
 # SPDX-License-Identifier: GPL-2.0-only
 
+import os
 import numpy as np
 import pandas as pd
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from .flume import Flume
+from .ensemble import simulate_flumes
+from .observers import SolverObserver
+from .cache import ProfileCache, profile_key
+from .instrumentation import SolverInstrumentation
+from .checkpoint import SolverCheckpoint
+from .store import ResultsStore
+from .geometry import FlumeGeometry
+from .steady import _rated_head
+
+def _estimated_cost(flume: Flume) -> float:
+    g = 9.81
+
+    if not flume.barriers:
+        return flume.geometry.length / max(flume.flow, 1e-6)
+
+    # Steps to fill the pool behind each barrier: fill time over a CFL step at the ponded depth
+    q = flume.flow / flume.geometry.width
+    cost = 0.0
+    pool_start = 0.0
+    for barrier_x, setup in flume.barriers:
+        try:
+            # The rating is not monotone across the plank edges, so root-find the head rather than invert a sampled curve
+            h_upstream = _rated_head(q, flume._get_barrier_fn(setup))
+        except Exception:
+            return np.inf
+
+        cost += ((barrier_x - pool_start) * h_upstream / max(q, 1e-6)) * np.sqrt(g * h_upstream)
+        pool_start = barrier_x
+
+    return cost
+
+def _warm_start_chains(flumes: list[Flume]) -> list[list[int]]:
+    chains = {}
+    for i, flume in enumerate(flumes):
+        chains.setdefault((tuple(flume.barriers), flume.incline), []).append(i)
+
+    return [sorted(chain, key=lambda i: flumes[i].flow) for chain in chains.values()]
+
+def _subset(values: list | None, indices: list[int]) -> list | None:
+    return [values[i] for i in indices] if values is not None else None
+
+def _simulate_chunk(flumes: list[Flume], observer: SolverObserver | None, ensemble: bool, method: str, warm_start: bool = False, stats_paths: list[Path] | None = None, checkpoints: list[SolverCheckpoint] | None = None, seeds: list[np.ndarray | None] | None = None) -> list:
+    # Kernel timings, checkpoints and grid sequencing are per engine, so those runs go one case at a time
+    if ensemble and method == "explicit" and stats_paths is None and checkpoints is None and all(flume.grid_levels == 1 and flume.refinement is None for flume in flumes):
+        try:
+            return simulate_flumes(flumes)
+        except Exception:
+            # Fall back to one case at a time so a single bad case cannot fail the whole chunk
+            pass
+
+    results = []
+    previous = None
+    for i, flume in enumerate(flumes):
+        try:
+            instrumentation = SolverInstrumentation() if stats_paths is not None else None
+            checkpoint = checkpoints[i] if checkpoints is not None else None
+            # A seed from an earlier solve of the same case beats the neighbouring flow's profile
+            seed = seeds[i] if seeds is not None and seeds[i] is not None else previous
+            profile = flume.simulate(observer, method, seed, instrumentation=instrumentation, checkpoint=checkpoint)
+            if instrumentation:
+                instrumentation.write(stats_paths[i])
+            results.append(profile)
+            if warm_start:
+                previous = profile
+        except Exception as e:
+            results.append(e)
+
+    return results
+
+def _start_mode(method: str, ensemble: bool, warm_start: bool, seeded: bool) -> str:
+    # Mirrors _solve: only per-case time marching takes a seed or a warm start
+    marching = method in ("explicit", "local")
+    if marching and seeded and not (ensemble and method == "explicit"):
+        return "seeded"
+    if marching and warm_start and not ensemble:
+        return "warm"
+
+    return "cold"
+
+def _solve_cached(flumes: list[Flume], observer: SolverObserver | None, ensemble: bool, workers: int | None, chunksize: int | None, method: str, warm_start: bool, cache: ProfileCache | None, stats_paths: list[Path] | None = None, checkpoints: list[SolverCheckpoint] | None = None, seeds: list[np.ndarray | None] | None = None) -> list:
+    if cache is None:
+        return _solve(flumes, observer, ensemble, workers, chunksize, method, warm_start, stats_paths, checkpoints, seeds)
+
+    # Look up in the parent so workers and ensembles only ever see the cases that need solving
+    keys = [cache.key(flume, method, _start_mode(method, ensemble, warm_start, seeds is not None and seeds[i] is not None)) for i, flume in enumerate(flumes)]
+    # Kernel timings only come out of a solve, so instrumented runs skip the lookup and refresh the cache instead
+    results = [cache.get(key) for key in keys] if stats_paths is None else [None] * len(flumes)
+    missing = [i for i, result in enumerate(results) if result is None]
+
+    if missing:
+        solved = _solve([flumes[i] for i in missing], observer, ensemble, workers, chunksize, method, warm_start, _subset(stats_paths, missing), _subset(checkpoints, missing), _subset(seeds, missing))
+        for i, result in zip(missing, solved):
+            results[i] = result
+            if not isinstance(result, Exception):
+                cache.put(keys[i], result)
+
+    return results
+
+def _solve(flumes: list[Flume], observer: SolverObserver | None, ensemble: bool, workers: int | None, chunksize: int | None, method: str, warm_start: bool = False, stats_paths: list[Path] | None = None, checkpoints: list[SolverCheckpoint] | None = None, seeds: list[np.ndarray | None] | None = None) -> list:
+    # One engine steps every case of an ensemble, so there is no single run for an observer to follow
+    if ensemble and observer is not None:
+        raise ValueError("Observers cannot follow an ensemble run")
+
+    # Only time marching benefits from a seed; the implicit solver starts better from the steady profile
+    warm_start = warm_start and not ensemble and method in ("explicit", "local")
+    seeds = seeds if method in ("explicit", "local") else None
+    workers = workers or os.cpu_count()
+
+    # Workers would each get their own copy of the observer, all writing to the same log or opening their own plots
+    if observer is not None and workers > 1:
+        raise ValueError("Observers can only follow runs in a single process")
+
+    if warm_start:
+        # Each chain shares a setup and climbs in flow, so every run starts from the nearest converged profile
+        chunks = _warm_start_chains(flumes)
+        chunks.sort(key=lambda chain: sum(_estimated_cost(flumes[i]) for i in chain), reverse=True)
+    elif workers == 1:
+        chunks = [list(range(len(flumes)))]
+    else:
+        if chunksize is None:
+            chunksize = -(-len(flumes) // workers) if ensemble else 1
+        order = sorted(range(len(flumes)), key=lambda i: _estimated_cost(flumes[i]), reverse=True)
+        chunks = [order[i:i + chunksize] for i in range(0, len(order), chunksize)]
+
+    results = [None] * len(flumes)
+
+    if workers == 1:
+        for chunk in chunks:
+            for i, result in zip(chunk, _simulate_chunk([flumes[i] for i in chunk], observer, ensemble, method, warm_start, _subset(stats_paths, chunk), _subset(checkpoints, chunk), _subset(seeds, chunk))):
+                results[i] = result
+
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_simulate_chunk, [flumes[i] for i in chunk], observer, ensemble, method, warm_start, _subset(stats_paths, chunk), _subset(checkpoints, chunk), _subset(seeds, chunk)): chunk
+            for chunk in chunks
+        }
+
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                chunk_results = future.result()
+            except Exception as e:
+                chunk_results = [e] * len(chunk)
+
+            for i, result in zip(chunk, chunk_results):
+                results[i] = result
+
+    return results
+
+def _profile_table(profile: np.ndarray, incline_fraction: float, length: float) -> np.ndarray:
+    # Profiles come back on a uniform grid whose spacing follows from their length
+    N = len(profile) - 2
+    dx = length / N
+    x_vals = np.linspace(dx / 2, length - (dx / 2), N)
+
+    eta = profile[1:-1, 0]
+    velocity = profile[1:-1, 1]
+
+    zb = -incline_fraction * x_vals
+
+    depth_m = np.maximum(eta - zb, 0.0)
+    depth_mm = depth_m * 1000.0
+
+    return np.column_stack((x_vals, depth_mm, velocity))
+
+def reproduce_friction_experiments(observer: SolverObserver | None = None, ensemble: bool = False, workers: int | None = 1, chunksize: int | None = None, method: str = "explicit", warm_start: bool = True, cache: ProfileCache | None = None, instrument: bool = False, export_csv: bool = False, integrator: str = "heun", adaptive_cfl: bool = False, well_balanced: bool = False, resolution: float | None = None, grid_levels: int = 1, refinement: float | None = None, dtype: type = np.float64, geometry: FlumeGeometry | None = None):
+    if instrument and method not in ("explicit", "local"):
+        raise ValueError("Instrumentation is only supported by the explicit solvers")
 
-def reproduce_friction_experiments():
     path = Path("data/ManningsNExperiments.csv")
     df = pd.read_csv(path)
-    
-    dx = 0.1
-    length = 12.5
-    N = int(length / dx)
-    x_vals = np.linspace(dx / 2, length - (dx / 2), N)
-    
+
     grouped = df.groupby(["Set Flow (l/s)", "Incline (%)"])
-    
+    cases = [key for key, _ in grouped]
+
     out_dir = Path("exports/numerical/friction")
     out_dir.mkdir(parents=True, exist_ok=True)
-    
-    for (flow_ls, incline_pct), group in grouped:
-        flow_m3s = flow_ls / 1000.0
-        incline_fraction = incline_pct / 100.0
-        
+
+    flumes = [
+        Flume(barrier_setup=None, set_flow=flow_ls / 1000.0, incline=incline_pct / 100.0, integrator=integrator, adaptive_cfl=adaptive_cfl, well_balanced=well_balanced, resolution=resolution, grid_levels=grid_levels, refinement=refinement, dtype=dtype, geometry=geometry)
+        for flow_ls, incline_pct in cases
+    ]
+
+    filenames = [f"{int(incline_pct * 10)}-{int(flow_ls)}.csv" for flow_ls, incline_pct in cases]
+    stats_paths = [(out_dir / filename).with_suffix(".json") for filename in filenames] if instrument else None
+
+    results = _solve_cached(flumes, observer, ensemble, workers, chunksize, method, warm_start, cache, stats_paths)
+
+    store = ResultsStore(out_dir)
+    store.clear()
+
+    for (flow_ls, incline_pct), flume, filename, result in zip(cases, flumes, filenames, results):
         try:
-            flume = Flume(barrier_setup=None, set_flow=flow_m3s, incline=incline_fraction)
-            profile = flume.simulate()
-            
-            eta = profile[1:-1, 0]
-            velocity = profile[1:-1, 1] 
-            
-            zb = -incline_fraction * x_vals
-            
-            depth_m = np.maximum(eta - zb, 0.0)
-            depth_mm = depth_m * 1000.0
-            
-            results_df = pd.DataFrame({
-                "X Position (m)": x_vals,
-                "Depth (mm)": depth_mm,
-                "Velocity (m/s)": velocity
-            })
-            
-            filename = f"{int(incline_pct * 10)}-{int(flow_ls)}.csv"
-            results_df.to_csv(out_dir / filename, index=False)
-                
+            if isinstance(result, Exception):
+                raise result
+
+            table = _profile_table(result, incline_pct / 100.0, flume.geometry.length)
+            store.append({"Set Flow (l/s)": flow_ls, "Incline (%)": incline_pct}, table)
+            if export_csv:
+                store.export_csv(table, out_dir / filename)
+
         except Exception as e:
             print(f"Solver failed to run for Flow: {flow_ls}, Incline: {incline_pct}. Error: {e}")
 
-def reproduce_barrier_experiments():
+def reproduce_barrier_experiments(observer: SolverObserver | None = None, ensemble: bool = False, workers: int | None = 1, chunksize: int | None = None, method: str = "explicit", warm_start: bool = True, cache: ProfileCache | None = None, instrument: bool = False, export_csv: bool = False, checkpoint_dir: Path | None = None, checkpoint_interval: float = 60.0, integrator: str = "heun", adaptive_cfl: bool = False, well_balanced: bool = False, resolution: float | None = None, grid_levels: int = 1, refinement: float | None = None, dtype: type = np.float64, geometry: FlumeGeometry | None = None):
+    if instrument and method not in ("explicit", "local"):
+        raise ValueError("Instrumentation is only supported by the explicit solvers")
+
     path = Path("data/BarrierExperiments.csv")
     df = pd.read_csv(path)
-    
-    dx = 0.1
-    length = 12.5
-    N = int(length / dx)
-    x_vals = np.linspace(dx / 2, length - (dx / 2), N)
-    
+
     grouped = df.groupby(["Barrier Setup", "Set Flow (l/s)"])
-    
+    cases = [key for key, _ in grouped]
+
     incline_fraction = 0.0
-    
+
     out_dir = Path("exports/numerical/barriers")
     out_dir.mkdir(parents=True, exist_ok=True)
-    
-    for (barrier_setup, flow_ls), group in grouped:
-        flow_m3s = flow_ls / 1000.0
-        
+
+    flumes = [
+        Flume(barrier_setup=barrier_setup, set_flow=flow_ls / 1000.0, incline=incline_fraction, integrator=integrator, adaptive_cfl=adaptive_cfl, well_balanced=well_balanced, resolution=resolution, grid_levels=grid_levels, refinement=refinement, dtype=dtype, geometry=geometry)
+        for barrier_setup, flow_ls in cases
+    ]
+
+    filenames = [f"{barrier_setup}-{flow_ls}.csv" for barrier_setup, flow_ls in cases]
+    stats_paths = [(out_dir / filename).with_suffix(".json") for filename in filenames] if instrument else None
+
+    # Rerunning with the same directory resumes each case from its last checkpoint
+    checkpoints = None
+    if checkpoint_dir is not None:
+        checkpoints = [
+            SolverCheckpoint(Path(checkpoint_dir) / Path(filename).with_suffix(".npz"), checkpoint_interval, profile_key(flume, method, _start_mode(method, ensemble, warm_start, False)))
+            for flume, filename in zip(flumes, filenames)
+        ]
+
+    results = _solve_cached(flumes, observer, ensemble, workers, chunksize, method, warm_start, cache, stats_paths, checkpoints)
+
+    store = ResultsStore(out_dir)
+    store.clear()
+
+    for (barrier_setup, flow_ls), flume, filename, result in zip(cases, flumes, filenames, results):
         try:
-            flume = Flume(barrier_setup=barrier_setup, set_flow=flow_m3s, incline=incline_fraction)
-            profile = flume.simulate()
-            
-            eta = profile[1:-1, 0]
-            velocity = profile[1:-1, 1] 
-            
-            zb = -incline_fraction * x_vals
-            depth_m = np.maximum(eta - zb, 0.0)
-            depth_mm = depth_m * 1000.0
-            
-            results_df = pd.DataFrame({
-                "X Position (m)": x_vals,
-                "Depth (mm)": depth_mm,
-                "Velocity (m/s)": velocity
-            })
-            
-            filename = f"{barrier_setup}-{flow_ls}.csv"
-            results_df.to_csv(out_dir / filename, index=False)
-                
+            if isinstance(result, Exception):
+                raise result
+
+            table = _profile_table(result, incline_fraction, flume.geometry.length)
+            store.append({"Barrier Setup": barrier_setup, "Set Flow (l/s)": flow_ls}, table)
+            if export_csv:
+                store.export_csv(table, out_dir / filename)
+
         except Exception as e:
-            print(f"Solver failed to run for Barrier Setup: {barrier_setup}, Flow: {flow_ls}. Error: {e}")
\ No newline at end of file
+            print(f"Solver failed to run for Barrier Setup: {barrier_setup}, Flow: {flow_ls}. Error: {e}")
@@ -69,11 +69,11 @@ def add_function_to_plot(
 
     return fig
 
-def create_barrier_depth_diagram(barrier_setup: str, us_profile: np.ndarray, ds_profile: np.ndarray, point_data: pd.DataFrame = None, title: str = ""):
-    FLUME_LENGTH = 12500
+def create_barrier_depth_diagram(barrier_setup: str, us_profile: np.ndarray, ds_profile: np.ndarray, point_data: pd.DataFrame = None, title: str = "", flume_length: float = 12500, barrier_x: float = 5000):
+    FLUME_LENGTH = flume_length
     FLUME_DEPTH = 800
     BARRIER_WIDTH = 15
-    BARRIER_X_CENTER = 5000
+    BARRIER_X_CENTER = barrier_x
 
     fig_width_in = 15.92 * 0.393701
     fig_height_in = (9.84 * 0.393701) / 2
@@ -82,11 +82,11 @@ def create_barrier_depth_diagram(barrier_setup: str, us_profile: np.ndarray, ds_
 
     water_colour = "aqua"
 
-    us_x = np.linspace(0, 5000, num=5000)
+    us_x = np.linspace(0, BARRIER_X_CENTER, num=len(us_profile))
     ax.plot(us_x, us_profile, color=water_colour)
     ax.fill_between(us_x, us_profile, 0, color=water_colour)
 
-    ds_x = np.linspace(5000, 12500, num=7500)
+    ds_x = np.linspace(BARRIER_X_CENTER, FLUME_LENGTH, num=len(ds_profile))
     ax.plot(ds_x, ds_profile, color=water_colour)
     ax.fill_between(ds_x, ds_profile, 0, color=water_colour)
 
@@ -126,7 +126,7 @@ def create_barrier_depth_diagram(barrier_setup: str, us_profile: np.ndarray, ds_
     ax.xaxis.set_minor_locator(MultipleLocator(100))
 
     def x_label_filter(x, pos):
-        if x in [0, 5000, 12500]:
+        if x in [0, BARRIER_X_CENTER, FLUME_LENGTH]:
             return f"{int(x)}"
         return ""
     ax.xaxis.set_major_formatter(FuncFormatter(x_label_filter))
@@ -145,8 +145,9 @@ def create_barrier_depth_diagram(barrier_setup: str, us_profile: np.ndarray, ds_
 
     return fig
 
-def create_friction_depth_diagram(incline: float, x_profile: np.ndarray, depth_profile: np.ndarray, point_data: pd.DataFrame = None, title: str = ""):
-    FLUME_LENGTH = 12500
+def create_friction_depth_diagram(incline: float, x_profile: np.ndarray, depth_profile: np.ndarray, point_data: pd.DataFrame = None, title: str = "", flume_length: float = 12500, barrier_x: float | None = 5000):
+    FLUME_LENGTH = flume_length
+    LABELLED_X = [0, FLUME_LENGTH] if barrier_x is None else [0, barrier_x, FLUME_LENGTH]
     FLUME_DEPTH = 800
 
     fig_width_in = 15.92 * 0.393701
@@ -156,7 +157,7 @@ def create_friction_depth_diagram(incline: float, x_profile: np.ndarray, depth_p
 
     water_colour = "aqua"
 
-    bed_profile = (12500 - x_profile) * (incline / 100)
+    bed_profile = (FLUME_LENGTH - x_profile) * (incline / 100)
     water_surface = bed_profile + depth_profile
 
     ax.plot(x_profile, water_surface, color=water_colour)
@@ -167,7 +168,7 @@ def create_friction_depth_diagram(incline: float, x_profile: np.ndarray, depth_p
     if point_data is not None and not point_data.empty:
         if "X Position (mm)" in point_data.columns and "Depth (mm)" in point_data.columns:
             pt_x = point_data["X Position (mm)"]
-            pt_bed = (12500 - pt_x) * (incline / 100)
+            pt_bed = (FLUME_LENGTH - pt_x) * (incline / 100)
             pt_water = pt_bed + point_data["Depth (mm)"]
             ax.scatter(pt_x, pt_water, color="red", marker="x", zorder=20, s=25, label="Measured Depth")
 
@@ -187,7 +188,7 @@ def create_friction_depth_diagram(incline: float, x_profile: np.ndarray, depth_p
     ax.xaxis.set_minor_locator(MultipleLocator(100))
 
     def x_label_filter(x, pos):
-        if x in [0, 5000, 12500]:
+        if x in LABELLED_X:
             return f"{int(x)}"
         return ""
     ax.xaxis.set_major_formatter(FuncFormatter(x_label_filter))
@@ -2,8 +2,6 @@
 #
 # SPDX-License-Identifier: GPL-2.0-only
 
-import re
-
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
@@ -12,6 +10,8 @@ import numpy as np
 from .baseplots import *
 from .io import *
 from src.analysis import *
+from src.solver.store import ResultsStore
+from src.solver.geometry import FlumeGeometry
 from tqdm import tqdm
 
 
@@ -76,24 +76,26 @@ def visualisation_1_5(lab_data: pd.DataFrame):
         add_function_to_plot(us_depth_fig, simple_combined_model.plotting_function, (min_us_depth, max_us_depth), 0.001, f"{setup} Model", 1000, 1, setup)
         save_figure(us_depth_fig, setup, "AdvancedCombinedAllSetups")
 
-def visualisation_1_6(lab_data: pd.DataFrame):
+def visualisation_1_6(lab_data: pd.DataFrame, geometry: FlumeGeometry | None = None):
+    geometry = geometry or FlumeGeometry()
+    length_mm = geometry.length * 1000
+    barrier_mm = geometry.barrier_x[0] * 1000
+
     data_directory = Path("exports/numerical/barriers")
     output_directory = Path("exports/figures/numerical/barriers/")
     output_directory.mkdir(parents=True, exist_ok=True)
     
-    file_paths = list(data_directory.glob("*-*-*-*.csv"))
+    store = ResultsStore(data_directory)
     
-    for file_path in tqdm(file_paths):
-        parts = file_path.stem.split("-")
-        barrier_setup = f"{parts[0]}-{parts[1]}-{parts[2]}"
-        flow_rate = float(parts[3])
+    for params, sim in tqdm(list(store)):
+        barrier_setup = params["Barrier Setup"]
+        flow_rate = float(params["Set Flow (l/s)"])
         
-        df = pd.read_csv(file_path)
-        x_mm = df["X Position (m)"].values * 1000
-        depth = df["Depth (mm)"].values
+        x_mm = sim[:, 0] * 1000
+        depth = sim[:, 1]
         
-        us_x = np.linspace(0, 5000, num=5000)
-        ds_x = np.linspace(5000, 12500, num=7500)
+        us_x = np.linspace(0, barrier_mm, num=int(barrier_mm))
+        ds_x = np.linspace(barrier_mm, length_mm, num=int(length_mm - barrier_mm))
         
         us_profile = np.interp(us_x, x_mm, depth)
         ds_profile = np.interp(ds_x, x_mm, depth)
@@ -108,30 +110,31 @@ def visualisation_1_6(lab_data: pd.DataFrame):
         if not point_data.empty and "X Position (mm)" in point_data.columns and "Depth (mm)" in point_data.columns:
             point_data = point_data.groupby("X Position (mm)", as_index=False)["Depth (mm)"].mean()
         
-        fig = create_barrier_depth_diagram(barrier_setup, us_profile, ds_profile, point_data, title)
-        fig.savefig(output_directory / f"{file_path.stem}.svg")
+        # Named from the stored flow as it was read, like the exported CSV, so 20 l/s stays "20" rather than "20.0"
+        fig = create_barrier_depth_diagram(barrier_setup, us_profile, ds_profile, point_data, title, length_mm, barrier_mm)
+        fig.savefig(output_directory / f"{barrier_setup}-{params['Set Flow (l/s)']}.svg")
         plt.close(fig)
 
-def visualisation_1_7(measured_friction_data: pd.DataFrame):
+def visualisation_1_7(measured_friction_data: pd.DataFrame, geometry: FlumeGeometry | None = None):
+    geometry = geometry or FlumeGeometry()
+    length_mm = geometry.length * 1000
+    # The friction runs share the flume, so the barrier position stays marked for reference
+    barrier_mm = geometry.barrier_x[0] * 1000 if geometry.barrier_x else None
+
     data_directory = Path("exports/numerical/friction")
     output_directory = Path("exports/figures/numerical/friction/")
     output_directory.mkdir(parents=True, exist_ok=True)
     
-    file_paths = []
-    for p in data_directory.glob("*.csv"):
-        if re.match(r"^\d+-\d+(?:\.\d+)?\.csv$", p.name):
-            file_paths.append(p)
+    store = ResultsStore(data_directory)
             
-    for file_path in tqdm(file_paths):
-        parts = file_path.stem.split("-")
-        incline_pct = float(parts[0]) / 10.0
-        flow_rate = float(parts[1])
+    for params, sim in tqdm(list(store)):
+        incline_pct = float(params["Incline (%)"])
+        flow_rate = float(params["Set Flow (l/s)"])
         
-        df = pd.read_csv(file_path)
-        x_mm = df["X Position (m)"].values * 1000
-        depth = df["Depth (mm)"].values
+        x_mm = sim[:, 0] * 1000
+        depth = sim[:, 1]
         
-        x_profile = np.linspace(0, 12500, num=12500)
+        x_profile = np.linspace(0, length_mm, num=int(length_mm))
         depth_profile = np.interp(x_profile, x_mm, depth)
         
         title = f"Friction Experiment | Incline: {incline_pct}% | Flow: {flow_rate} l/s"
@@ -144,8 +147,8 @@ def visualisation_1_7(measured_friction_data: pd.DataFrame):
         if not point_data.empty and "X Position (mm)" in point_data.columns and "Depth (mm)" in point_data.columns:
             point_data = point_data.groupby("X Position (mm)", as_index=False)["Depth (mm)"].mean()
         
-        fig = create_friction_depth_diagram(incline_pct, x_profile, depth_profile, point_data, title)
-        fig.savefig(output_directory / f"{file_path.stem}.svg")
+        fig = create_friction_depth_diagram(incline_pct, x_profile, depth_profile, point_data, title, length_mm, barrier_mm)
+        fig.savefig(output_directory / f"{int(incline_pct * 10)}-{int(flow_rate)}.svg")
         plt.close(fig)
 
 def visualisation_1_8() -> go.Figure:
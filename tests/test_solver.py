@@ -0,0 +1,446 @@
+# SPDX-FileCopyrightText: 2026 Ellis Sinclair-Kent
+#
+# SPDX-License-Identifier: GPL-2.0-only
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.solver import Flume, FrictionParameters, ProfileCache, ResultsStore, benchmark_grid_scaling, SnapshotRecorder, SolverCheckpoint, SolverObserver, load_snapshots, calibrate_friction, barrier_sensitivity
+from src.solver.ensemble import simulate_ensemble, simulate_flumes
+from src.solver.validation import _profile_table, _solve_cached
+from src.solver.cache import profile_key
+from src.solver.engine import SolverEngine
+from src.solver.solver import simulate_barrier, _bed_geometry, _cell_layout
+from src.solver.mesh import graded_faces
+from src.solver.cfl import AdaptiveCFL
+from src.solver.geometry import FlumeGeometry
+from src.solver.unsteady import simulate_hydrograph
+from src.solver.steady import simulate_steady, _normal_depth
+from src.solver import implicit, sensitivity
+from src.analysis import objective
+
+def test_single_precision_ensemble():
+    friction = FrictionParameters(0.01, 0.012)
+    flows = [0.01, 0.02]
+    beds = [lambda x: -0.005 * x, lambda x: -0.002 * x]
+
+    _, double = simulate_ensemble(flows, beds, [friction] * 2)
+    _, single = simulate_ensemble(flows, beds, [friction] * 2, dtype=np.float32)
+
+    np.testing.assert_allclose(single, double, atol=1e-4)
+
+def test_single_precision_barrier():
+    friction = FrictionParameters(0.01, 0.012)
+
+    double = Flume("100-100-50", 0.02, 0.0, friction=friction).simulate()
+    single = Flume("100-100-50", 0.02, 0.0, friction=friction, dtype=np.float32).simulate()
+
+    assert single.dtype == np.float64
+    np.testing.assert_allclose(single, double, atol=1e-3)
+
+def test_barrier_cascade():
+    friction = FrictionParameters(0.01, 0.012)
+    cascade = [(9.0, "100-100-50"), (3.0, "100-100-50"), (6.0, "0-0-0")]
+
+    single = Flume("100-100-50", 0.02, 0.005, friction=friction).simulate(method="implicit")
+    listed = Flume([(5.0, "100-100-50")], 0.02, 0.005, friction=friction).simulate(method="implicit")
+
+    np.testing.assert_array_equal(listed, single)
+
+    steady = Flume(cascade, 0.02, 0.005, friction=friction).simulate(method="steady")
+    implicit = Flume(cascade, 0.02, 0.005, friction=friction).simulate(method="implicit")
+
+    np.testing.assert_allclose(implicit[:, 1], 0.02, rtol=0.1)
+    np.testing.assert_allclose(implicit[:, 0], steady[:, 0], atol=1e-2)
+
+def test_hydrograph_snapshots(tmp_path):
+    friction = FrictionParameters(0.01, 0.012)
+    flume = Flume(None, 0.02, 0.005, friction=friction)
+    base = flume.simulate()
+
+    recorder = SnapshotRecorder(tmp_path / "snapshots.npy", capacity=8, interval=1.0)
+    final = flume.simulate_hydrograph([[0.0, 0.02], [30.0, 0.02]], 30.0, recorder=recorder)
+    times, states, x = load_snapshots(tmp_path / "snapshots.npy")
+
+    np.testing.assert_allclose(final, base, atol=1e-3)
+    np.testing.assert_allclose(x, np.concatenate(([0.0], np.linspace(0.05, 12.45, 125), [12.5])))
+    assert len(times) <= 8 and times[0] == 0.0 and times[-1] == 30.0
+    assert np.all(np.diff(times) > 0)
+    np.testing.assert_array_equal(states[-1], final)
+
+def test_friction_calibration():
+    truth = FrictionParameters(0.011, 0.014)
+    rows = []
+    for flow_ls, incline_pct in [(10, 0.5), (30, 0.2)]:
+        profile = Flume(None, flow_ls / 1000.0, incline_pct / 100.0, friction=truth).simulate(method="steady")
+        table = _profile_table(profile, incline_pct / 100.0, 12.5)
+        for x_mm in (2000, 6000, 10000):
+            rows.append({"Set Flow (l/s)": flow_ls, "Incline (%)": incline_pct, "X Position (mm)": x_mm, "Depth (mm)": np.interp(x_mm / 1000.0, table[:, 0], table[:, 1])})
+
+    friction, summary = calibrate_friction(pd.DataFrame(rows), FrictionParameters(0.01, 0.012))
+
+    assert summary["Calibrated RMSE (mm)"] < summary["Initial RMSE (mm)"]
+    np.testing.assert_allclose([friction.n_bed, friction.n_wall], [0.011, 0.014], rtol=0.02)
+
+def test_barrier_sensitivity():
+    friction = FrictionParameters(0.011, 0.014)
+
+    indices = barrier_sensitivity("100-100-50", 20, samples=32, friction=friction, seed=1).set_index("Input")
+
+    assert indices["Failed Runs"].iloc[0] == 0
+    assert indices["Total Order"].idxmax() == "Contraction Coefficient"
+    assert indices["Total Order"]["Bed n"] < 0.01
+
+def test_ensemble_matches_single_runs():
+    friction = FrictionParameters(0.01, 0.012)
+    flumes = [Flume("100-100-50", 0.02, 0.0, friction=friction), Flume(None, 0.01, 0.005, friction=friction), Flume(None, 0.03, 0.002, friction=friction)]
+
+    # Cases converge at different times, so the engine compacts its rows twice along the way
+    for profile, flume in zip(simulate_flumes(flumes), flumes):
+        np.testing.assert_allclose(profile, flume.simulate(), atol=1e-12)
+
+def test_implicit_failure_is_not_cached(tmp_path, monkeypatch):
+    friction = FrictionParameters(0.01, 0.012)
+    cache = ProfileCache(tmp_path)
+
+    # A Newton step that never moves leaves the residual where it started
+    monkeypatch.setattr(implicit, "spsolve", lambda A, R: np.zeros_like(R))
+
+    results = _solve_cached([Flume(None, 0.02, 0.005, friction=friction)], None, False, 1, None, "implicit", False, cache)
+
+    assert isinstance(results[0], RuntimeError)
+    assert not list(tmp_path.glob("*.npz"))
+
+def test_implicit_follows_supercritical_flow_out(monkeypatch):
+    friction = FrictionParameters(0.01, 0.012)
+    flume = Flume(None, 0.08, 0.02, friction=friction)
+
+    # Discharge has to settle as well as depth before Newton stops
+    _, profile = implicit.simulate_implicit(0.08, lambda x: -0.02 * x, friction)
+    np.testing.assert_allclose(profile[1:-1, 1], 0.08, rtol=1e-6)
+    np.testing.assert_allclose(profile[1:-1, 0], flume.simulate()[1:-1, 0], atol=2e-3)
+
+    # A steady profile that cannot be found falls back to the uniform start rather than failing the run
+    def fail(*args):
+        raise ValueError("no rated head")
+    monkeypatch.setattr(implicit, "simulate_steady", fail)
+    fallback = implicit.simulate_implicit(0.02, lambda x: -0.005 * x, friction)[1]
+    np.testing.assert_allclose(fallback[1:-1, 0], Flume(None, 0.02, 0.005, friction=friction).simulate()[1:-1, 0], atol=2e-3)
+
+def test_instrumented_run_bypasses_cache(tmp_path):
+    cache = ProfileCache(tmp_path / "cache")
+    flumes = [Flume(None, 0.02, 0.005, friction=FrictionParameters(0.01, 0.012))]
+    stats = tmp_path / "stats.json"
+
+    cached = _solve_cached(flumes, None, False, 1, None, "explicit", False, cache)
+    instrumented = _solve_cached(flumes, None, False, 1, None, "explicit", False, cache, [stats])
+
+    assert stats.exists()
+    np.testing.assert_array_equal(instrumented[0], cached[0])
+
+def test_cache_key_separates_start_modes(tmp_path):
+    cache = ProfileCache(tmp_path)
+    flume = Flume("100-100-50", 0.02, 0.0, friction=FrictionParameters(0.01, 0.012))
+
+    keys = {cache.key(flume, "explicit", start) for start in ("cold", "warm", "seeded")}
+
+    assert len(keys) == 3
+
+class _Interrupted(Exception):
+    pass
+
+class _InterruptAt(SolverObserver):
+    def __init__(self, step: int):
+        super().__init__(frequency=1)
+        self.step = step
+
+    def update(self, step: int, t: float, Q: np.ndarray, max_change: float):
+        if step == self.step:
+            raise _Interrupted
+
+def test_checkpoint_resumes_interrupted_run(tmp_path):
+    flume = Flume(None, 0.02, 0.005, friction=FrictionParameters(0.01, 0.012))
+    key = profile_key(flume, "explicit")
+    path = tmp_path / "run.npz"
+    base = flume.simulate()
+
+    with pytest.raises(_Interrupted):
+        flume.simulate(_InterruptAt(200), checkpoint=SolverCheckpoint(path, 0.0, key))
+    assert SolverCheckpoint(path, 0.0, key).load(base.T.shape)["step"] == 200
+
+    resumed = flume.simulate(checkpoint=SolverCheckpoint(path, 0.0, key))
+
+    np.testing.assert_array_equal(resumed, base)
+    assert not path.exists()
+
+def test_checkpoint_resumes_adaptive_cfl(tmp_path):
+    flume = Flume("100-100-50", 0.02, 0.0, friction=FrictionParameters(0.01, 0.012), adaptive_cfl=True)
+    key = profile_key(flume, "explicit")
+    path = tmp_path / "run.npz"
+    base = flume.simulate()
+
+    with pytest.raises(_Interrupted):
+        flume.simulate(_InterruptAt(500), checkpoint=SolverCheckpoint(path, 0.0, key))
+    # By now the Courant number has grown well away from where a fresh run starts
+    assert SolverCheckpoint(path, 0.0, key).load(base.T.shape)["courant"] > 0.8
+
+    resumed = flume.simulate(checkpoint=SolverCheckpoint(path, 0.0, key))
+
+    np.testing.assert_array_equal(resumed, base)
+
+def test_checkpoint_from_another_run_is_ignored(tmp_path):
+    friction = FrictionParameters(0.01, 0.012)
+    flume = Flume(None, 0.02, 0.005, friction=friction)
+    other = Flume(None, 0.03, 0.005, friction=friction)
+    path = tmp_path / "run.npz"
+    base = flume.simulate()
+
+    SolverCheckpoint(path, 0.0, profile_key(other, "explicit")).save(other.simulate().T, 600.0, 1, 0.0)
+
+    np.testing.assert_array_equal(flume.simulate(checkpoint=SolverCheckpoint(path, 0.0, profile_key(flume, "explicit"))), base)
+
+def test_well_balanced_steady_states():
+    friction = FrictionParameters(0.01, 0.012)
+    dx, x_vals = _cell_layout(12.5, 0.1)
+
+    # Uniform flow at normal depth down an incline, with the outlet passing that depth straight through
+    zb, zb_interface = _bed_geometry(lambda x: -0.005 * x, x_vals, 12.5, True)
+    engine = SolverEngine(zb, zb_interface, dx, 0.02, friction, well_balanced=True, outlet="free")
+    engine.U[0] = zb + _normal_depth(0.02, 0.005, friction)
+    engine.U[1] = 0.02
+    engine.apply_bcs(engine.U)
+
+    assert np.abs(engine.residual(engine.U, np.zeros_like(engine.U))[:, 1:-1]).max() < 1e-12
+
+    # A lake at rest over a bumpy bed, ghosts included
+    zb, zb_interface = _bed_geometry(lambda x: 0.05 * np.exp(-(x - 6.0) ** 2) + 0.02 * np.sin(3.0 * x), x_vals, 12.5, True)
+    engine = SolverEngine(zb, zb_interface, dx, 0.0, friction, well_balanced=True)
+    engine.U[0] = 0.2
+    engine.U[1] = 0.0
+
+    assert np.abs(engine.residual(engine.U, np.zeros_like(engine.U))[:, 1:-1]).max() < 1e-12
+
+def test_graded_mesh_lake_at_rest():
+    friction = FrictionParameters(0.01, 0.012)
+    faces = graded_faces(3.0, 0.1, 0.01, [1.5], [1.5])
+    dx, x_vals = _cell_layout(3.0, 0.1, faces)
+
+    for well_balanced in (False, True):
+        zb, zb_interface = _bed_geometry(lambda x: 0.05 * np.exp(-(x - 1.5) ** 2) + 0.02 * np.sin(8.0 * x), x_vals, 3.0, well_balanced, faces)
+        engine = SolverEngine(zb, zb_interface, dx, 0.0, friction, well_balanced=well_balanced)
+        engine.U[0] = 0.2
+        engine.U[1] = 0.0
+
+        assert np.abs(engine.residual(engine.U, np.zeros_like(engine.U))[:, 1:-1]).max() < 1e-12
+
+def test_graded_mesh_matches_uniform_grid():
+    friction = FrictionParameters(0.01, 0.012)
+    geometry = FlumeGeometry(length=3.0, resolution=0.1, barrier_x=(1.5,))
+
+    graded = Flume("100-100-50", 0.02, 0.0, friction=friction, geometry=geometry, refinement=0.01).simulate()
+    uniform = Flume("100-100-50", 0.02, 0.0, friction=friction, geometry=geometry.replace(resolution=0.01)).simulate()
+
+    assert graded.shape == uniform.shape
+    np.testing.assert_allclose(graded[:, 0], uniform[:, 0], atol=1e-3)
+
+def test_default_geometry_is_the_original_flume():
+    friction = FrictionParameters(0.01, 0.012)
+    original = FlumeGeometry(length=12.5, width=1.0, resolution=0.1, barrier_x=(5.0,), outlet="critical")
+
+    # Width and outlet handling must leave the 1 m wide flume with a critical outlet bit for bit as it was
+    for barrier_setup, incline, method in [(None, 0.005, "explicit"), ("100-100-50", 0.0, "explicit"), ("100-100-50", 0.0, "steady")]:
+        default = Flume(barrier_setup, 0.02, incline, friction=friction).simulate(method=method)
+        spelled_out = Flume(barrier_setup, 0.02, incline, friction=friction, geometry=original).simulate(method=method)
+
+        np.testing.assert_array_equal(default, spelled_out)
+
+def test_steady_matches_explicit_for_width_and_outlets():
+    friction = FrictionParameters(0.01, 0.012)
+    cases = [
+        (FlumeGeometry(width=2.0), 0.04, 0.005, 5e-3),
+        (FlumeGeometry(width=0.5), 0.01, 0.005, 5e-3),
+        (FlumeGeometry(outlet="free"), 0.02, 0.005, 1e-3),
+        (FlumeGeometry(outlet=0.08), 0.02, 0.002, 1e-3),
+        # Supercritical all the way out, so the critical outlet stays transmissive
+        (FlumeGeometry(), 0.08, 0.005, 1e-2),
+        (FlumeGeometry(), 0.08, 0.02, 4e-2),
+    ]
+
+    for geometry, flow, incline, atol in cases:
+        steady = Flume(None, flow, incline, friction=friction, geometry=geometry).simulate(method="steady")
+        explicit = Flume(None, flow, incline, friction=friction, geometry=geometry).simulate()
+
+        np.testing.assert_allclose(explicit[1:-1, 0], steady[1:-1, 0], atol=atol)
+        np.testing.assert_allclose(explicit[1:-1, 1] * geometry.width, flow, rtol=0.02)
+
+def test_ensemble_without_barrier_positions():
+    friction = FrictionParameters(0.01, 0.012)
+    geometry = FlumeGeometry(barrier_x=())
+    flumes = [Flume(None, 0.02, 0.005, friction=friction, geometry=geometry), Flume(None, 0.01, 0.002, friction=friction, geometry=geometry)]
+
+    for profile, flume in zip(simulate_flumes(flumes), flumes):
+        np.testing.assert_allclose(profile, flume.simulate(), atol=1e-12)
+
+def test_hydrograph_routes_a_flood_wave(tmp_path):
+    flume = Flume(None, 0.02, 0.005, friction=FrictionParameters(0.01, 0.012))
+
+    recorder = SnapshotRecorder(tmp_path / "snapshots.npy", capacity=256, interval=0.5)
+    flume.simulate_hydrograph([[0.0, 0.02], [10.0, 0.04], [20.0, 0.02]], 60.0, recorder=recorder)
+    times, states, _ = load_snapshots(tmp_path / "snapshots.npy")
+    outflow = states[:, -2, 1]
+
+    # The outlet holds the base flow until the wave arrives, peaks after the inflow does and settles back once it has passed
+    assert times[-1] == 60.0
+    np.testing.assert_allclose(outflow[times < 8.0], 0.02, rtol=0.01)
+    assert 10.0 < times[np.argmax(outflow)] < 25.0
+    assert 0.03 < outflow.max() <= 0.04
+    np.testing.assert_allclose(outflow[-1], 0.02, rtol=0.05)
+
+def test_hydrograph_starts_from_unsorted_barriers():
+    friction = FrictionParameters(0.01, 0.012)
+    flume = Flume([(3.0, "0-0-0"), (9.0, "100-100-50")], 0.02, 0.005, friction=friction)
+    tables = [flume._get_barrier_table("100-100-50"), flume._get_barrier_table("0-0-0")]
+    geometry = FlumeGeometry(barrier_x=(9.0, 3.0))
+
+    def bed_fn(x):
+        return -0.005 * x
+
+    # With no time to march, the run hands back its starting steady profile with each barrier at its own position
+    _, start = simulate_hydrograph([[0.0, 0.02], [1.0, 0.02]], 0.0, bed_fn, friction, tables, geometry=geometry)
+    steady = simulate_steady(0.02, bed_fn, friction, tables, geometry)
+
+    np.testing.assert_array_equal(start[1:-1], steady[1:-1])
+    np.testing.assert_array_equal(steady, flume.simulate(method="steady"))
+
+def test_sensitivity_survives_failed_runs(monkeypatch):
+    friction = FrictionParameters(0.011, 0.014)
+
+    with pytest.raises(ValueError):
+        barrier_sensitivity("100-100-50", 20, samples=12, friction=friction)
+
+    # One failed solve drops its row from every estimator, leaving a sample that is no longer a power of two
+    solve = sensitivity._solve
+    def solve_with_failure(flumes, *args):
+        results = solve(flumes, *args)
+        results[3] = RuntimeError("did not converge")
+        return results
+    monkeypatch.setattr(sensitivity, "_solve", solve_with_failure)
+
+    indices = barrier_sensitivity("100-100-50", 20, samples=16, friction=friction, seed=1).set_index("Input")
+
+    assert indices["Failed Runs"].iloc[0] == 1
+    assert np.isfinite(indices[["First Order", "Total Order"]].to_numpy()).all()
+    assert indices["Total Order"].idxmax() == "Contraction Coefficient"
+
+def test_local_timestep_converges_at_a_barrier():
+    friction = FrictionParameters(0.01, 0.012)
+    table = Flume("100-100-50", 0.005, 0.0, friction=friction)._get_barrier_table("100-100-50")
+
+    # At low flow the Heun stages beside the barrier face settle cancelling each other, which a single stage never sees
+    _, global_profile, global_steps = simulate_barrier(0.005, None, friction, [table])
+    t, local_profile, local_steps = simulate_barrier(0.005, None, friction, [table], local_timestep=True)
+
+    assert t < 36000 and local_steps < 2 * global_steps
+    np.testing.assert_allclose(local_profile[:, 0], global_profile[:, 0], atol=2e-3)
+
+def test_grouped_metrics_match_objective_functions():
+    rng = np.random.default_rng(0)
+    observed = rng.uniform(0.02, 0.1, 30)
+    predicted = observed + rng.normal(0.0, 0.005, 30)
+    groups = np.repeat([0, 1, 2], 10)
+
+    # A missing gauge reading must only drop that point, not its whole group
+    observed[3] = np.nan
+    predicted[25] = np.inf
+
+    metrics = objective.grouped_metrics(observed, predicted, groups, 3)
+
+    for group in range(3):
+        finite = (groups == group) & np.isfinite(observed) & np.isfinite(predicted)
+        o, p = pd.Series(observed[finite]), pd.Series(predicted[finite])
+        row = metrics.iloc[group]
+
+        assert row["Count"] == finite.sum()
+        np.testing.assert_allclose(row["RMSE"], objective.rmse(o, p))
+        np.testing.assert_allclose(row["MAE"], objective.mae(o, p))
+        np.testing.assert_allclose(row["Absolute Bias"], objective.bias(o, p))
+        np.testing.assert_allclose(row["Variability Ratio"], objective.variability(o, p))
+        np.testing.assert_allclose(row["Correlation"], objective.correlation(o, p))
+        np.testing.assert_allclose(row["KGE"], objective._kge(o, p))
+        np.testing.assert_allclose(row["R Squared"], objective.r2(o, p))
+
+def test_results_store_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    first = rng.random((125, 3))
+    second = rng.random((80, 3))
+    rerun = rng.random((125, 3))
+
+    store = ResultsStore(tmp_path / "store")
+    store.append({"Flow (l/s)": 20, "Incline (%)": 0.5}, first)
+    store.append({"Flow (l/s)": 30, "Incline (%)": 0.5}, second)
+
+    # A fresh handle on the same directory appends after what is already on disk
+    store = ResultsStore(tmp_path / "store")
+    store.append({"Flow (l/s)": 20, "Incline (%)": 0.5}, rerun)
+
+    assert (tmp_path / "store" / "profiles.f64").stat().st_size == 8 * 3 * (2 * 125 + 80)
+    assert len(pd.read_csv(tmp_path / "store" / "index.csv")) == 3
+    assert len(store.index()) == 2
+
+    np.testing.assert_array_equal(store.get({"Flow (l/s)": 20, "Incline (%)": 0.5}), rerun)
+    np.testing.assert_array_equal(store.get({"Flow (l/s)": 30}), second)
+    assert store.get({"Flow (l/s)": 40}) is None
+
+    cases = store.cases(["Flow (l/s)", "Incline (%)"])
+    assert set(cases) == {(20, 0.5), (30, 0.5)}
+    np.testing.assert_array_equal(cases[(30, 0.5)], second)
+
+    store.clear()
+    assert store.get({"Flow (l/s)": 20}) is None
+
+def test_adaptive_cfl_reaches_the_same_steady_state_sooner():
+    friction = FrictionParameters(0.01, 0.012)
+    table = [Flume("100-100-50", 0.02, 0.0, friction=friction)._get_barrier_table("100-100-50")]
+
+    _, base, base_steps = simulate_barrier(0.02, None, friction, table)
+    for integrator in ("heun", "ssprk3"):
+        cfl = AdaptiveCFL()
+        _, profile, steps = simulate_barrier(0.02, None, friction, table, integrator=integrator, cfl=cfl)
+
+        np.testing.assert_allclose(profile, base, atol=1e-4)
+        assert steps < 0.85 * base_steps
+        assert cfl.rejected > 0
+
+def test_grid_sequencing_matches_single_grid():
+    friction = FrictionParameters(0.01, 0.012)
+
+    # The coarse levels only seed the target grid, so both runs stop on the same converged profile
+    for barrier_setup, flow, incline in [(None, 0.02, 0.005), ("100-100-50", 0.02, 0.0)]:
+        single = Flume(barrier_setup, flow, incline, friction=friction).simulate()
+        sequenced = Flume(barrier_setup, flow, incline, friction=friction, grid_levels=2).simulate()
+
+        assert sequenced.shape == single.shape
+        np.testing.assert_allclose(sequenced, single, atol=1e-3)
+
+def test_benchmark_reports_convergence():
+    results = benchmark_grid_scaling(cells=(100, 400), steps=5, max_steady_cells=100, friction=FrictionParameters(0.01, 0.012))
+
+    # Only the measured grid has a run whose convergence can be reported
+    assert results["Converged"].tolist() == [True, None]
+    assert results["Estimated"].tolist() == [False, True]
+    steps = results["Steps To Steady (estimated above 100 cells)"]
+    assert steps[1] == 4 * steps[0]
+
+def test_refined_hydrograph_snapshots_carry_the_mesh(tmp_path):
+    flume = Flume("100-100-50", 0.02, 0.0, friction=FrictionParameters(0.01, 0.012), refinement=0.025)
+
+    recorder = SnapshotRecorder(tmp_path / "snapshots.npy", capacity=8, interval=1.0)
+    final = flume.simulate_hydrograph([[0.0, 0.02], [5.0, 0.02]], 5.0, recorder=recorder)
+    _, states, x = load_snapshots(tmp_path / "snapshots.npy")
+
+    # Graded cells are finest at the barrier, and the recorded last state lands on the profile resampled at the fine cell size
+    assert len(x) == states.shape[1] and x[0] == 0.0 and x[-1] == 12.5
+    spacing = np.diff(x[1:-1])
+    assert spacing.min() < 0.5 * spacing.max()
+    assert abs(x[1:][np.argmin(spacing)] - 5.0) < 0.1
+    np.testing.assert_allclose(np.interp(np.linspace(0.0125, 12.4875, 500), x, states[-1, :, 0]), final[1:-1, 0], atol=5e-3)